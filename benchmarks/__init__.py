@@ -0,0 +1,3 @@
+"""
+Benchmarks for the test framework itself (run: python -m benchmarks.run).
+"""
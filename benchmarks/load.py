@@ -0,0 +1,387 @@
+"""
+Load mode: N concurrent virtual users replaying the smoke journey against
+the local stand-in.
+
+Each virtual user (VU) loops over the journey register -> login -> browse ->
+add to cart -> view cart -> delete item -> checkout, either
+
+- in its own headless browser through the page objects (--mode browser), or
+- as the equivalent page and API requests over HTTP (--mode http, default;
+  far lighter, so it scales to many more users).
+
+VUs start evenly over --ramp-up seconds and keep running journeys until
+--duration has passed (or --iterations journeys each). Journey and step
+latencies (p50/p90/p95/p99) and throughput go to reports/load/load.json,
+plus charts if matplotlib is installed.
+
+    python -m benchmarks.load --users 20 --ramp-up 10 --duration 60
+    python -m benchmarks.load --mode browser --users 4 --iterations 3 --api-latency-ms 50
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import requests
+from selenium.webdriver.common.by import By
+
+from tests import utils
+from tests.driver_pool import reset_session
+from tests.instrumentation import percentile
+from tests.pages.home_page import HomePage
+from tests.provisioning import DEFAULT_PASSWORD, encode_password
+from tests.stand_in import StandInServer
+
+try:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from matplotlib import pyplot
+except ImportError:  # optional: JSON only without it
+    pyplot = None
+
+
+DEFAULT_OUTPUT_DIR = utils.ROOT / "reports" / "load"
+STEPS = ("home", "register", "login", "browse", "add_to_cart", "view_cart", "delete_item", "checkout")
+ORDER = ("Load User", "Country", "City", "4111111111111111", "12", "2030")
+
+
+class Results:
+    """Thread-safe sample sink shared by every virtual user."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.steps = []  # (step, started, seconds, ok)
+        self.journeys = []  # (vu, started, seconds, ok, error)
+        self.sessions = []  # (vu, started, finished)
+
+    def step(self, name, started, seconds, ok):
+        with self._lock:
+            self.steps.append((name, started, seconds, ok))
+
+    def journey(self, vu, started, seconds, ok, error=None):
+        with self._lock:
+            self.journeys.append((vu, started, seconds, ok, error))
+
+    def session(self, vu, started, finished):
+        with self._lock:
+            self.sessions.append((vu, started, finished))
+
+
+class Journey:
+    """Times each step; the first failing step ends the journey."""
+
+    def __init__(self, results, vu):
+        self.results = results
+        self.vu = vu
+
+    def run(self, steps):
+        started = time.time()
+        t0 = time.perf_counter()
+        for name, action in steps:
+            s0 = time.perf_counter()
+            try:
+                action()
+            except Exception as exc:  # noqa: BLE001 - any failure counts as an error sample
+                self.results.step(name, time.time(), time.perf_counter() - s0, False)
+                self.results.journey(self.vu, started, time.perf_counter() - t0, False, f"{name}: {exc!r}"[:200])
+                return False
+            self.results.step(name, time.time(), time.perf_counter() - s0, True)
+        self.results.journey(self.vu, started, time.perf_counter() - t0, True)
+        return True
+
+
+# ----------------------
+# Virtual users
+# ----------------------
+class HttpUser:
+    """The journey as the browser's own page and API requests, without a browser."""
+
+    def __init__(self):
+        self.http = requests.Session()
+        self.token = None
+
+    def _page(self, name):
+        self.http.get(f"{utils.BASE_URL}/{name}", timeout=30).raise_for_status()
+
+    def _api(self, path, payload):
+        resp = self.http.post(f"{utils.API_URL}/{path}", json=payload, timeout=30)
+        resp.raise_for_status()
+        body = resp.json() if resp.content else None
+        if isinstance(body, dict) and "errorMessage" in body:
+            raise AssertionError(f"{path}: {body['errorMessage']}")
+        return body
+
+    def steps(self):
+        username = f"load_{uuid.uuid4().hex[:10]}"
+        password = encode_password(DEFAULT_PASSWORD)
+        state = {}
+
+        def home():
+            self._page("index.html")
+            self._api("entries", {})
+
+        def register():
+            self._api("signup", {"username": username, "password": password})
+
+        def login():
+            self.token = self._api("login", {"username": username, "password": password}).split("Auth_token: ")[1]
+
+        def browse():
+            for cat in ("phone", "notebook", "monitor"):
+                self._api("bycat", {"cat": cat})
+
+        def add_to_cart():
+            for prod_id in (1, 9):
+                self._page(f"prod.html?idp_={prod_id}")
+                self._api("view", {"id": str(prod_id)})
+                self._api(
+                    "addtocart", {"id": str(uuid.uuid4()), "cookie": self.token, "prod_id": prod_id, "flag": True}
+                )
+
+        def view_cart():
+            self._page("cart.html")
+            state["items"] = self._api("viewcart", {"cookie": self.token, "flag": True})["Items"]
+            for item in state["items"]:
+                self._api("view", {"id": str(item["prod_id"])})
+            assert len(state["items"]) >= 2, "cart is missing items"
+
+        def delete_item():
+            self._api("deleteitem", {"id": state["items"][0]["id"]})
+
+        def checkout():
+            self._api("deletecart", {"cookie": self.token})
+
+        return list(zip(STEPS, (home, register, login, browse, add_to_cart, view_cart, delete_item, checkout)))
+
+    def reset(self):
+        self.http.cookies.clear()
+
+    def close(self):
+        self.http.close()
+
+
+class BrowserUser:
+    """The journey through HomePage/CartPage in a headless browser of its own."""
+
+    def __init__(self, profile):
+        self.driver = utils.make_driver(profile=profile)
+
+    def steps(self):
+        username = utils.generate_username()
+        state = {}
+
+        def home():
+            state["home"] = HomePage(self.driver).open()
+
+        def register():
+            alert = state["home"].register(username, DEFAULT_PASSWORD)
+            assert "sign up" in alert.lower() or "successful" in alert.lower(), alert
+
+        def login():
+            state["home"].login(username, DEFAULT_PASSWORD)
+
+        def browse():
+            for category in ("Phones", "Laptops", "Monitors"):
+                state["home"].browse_category(category)
+
+        def add_to_cart():
+            state["home"].add_product_in_category("Phones", 0)
+            state["home"].add_product_in_category("Laptops", 0)
+
+        def view_cart():
+            state["cart"] = state["home"].go_to_cart()
+            assert len(state["cart"].rows()) >= 2, "cart is missing items"
+
+        def delete_item():
+            state["cart"].delete_first_row()
+
+        def checkout():
+            modal = state["cart"].checkout(*ORDER)
+            modal.find_element(By.CSS_SELECTOR, "button.confirm").click()
+
+        return list(zip(STEPS, (home, register, login, browse, add_to_cart, view_cart, delete_item, checkout)))
+
+    def reset(self):
+        reset_session(self.driver)
+
+    def close(self):
+        self.driver.quit()
+
+
+def virtual_user(vu, args, results, start_at, stop_at):
+    time.sleep(max(0.0, start_at - time.time()))
+    if time.time() >= stop_at:
+        return
+    started = time.time()
+    try:
+        user = BrowserUser(args.profile) if args.mode == "browser" else HttpUser()
+    except Exception as exc:  # noqa: BLE001 - a VU that cannot start is an error sample
+        results.journey(vu, started, 0.0, False, f"startup: {exc!r}"[:200])
+        return
+    try:
+        done = 0
+        while time.time() < stop_at and (not args.iterations or done < args.iterations):
+            Journey(results, vu).run(user.steps())
+            user.reset()  # next journey starts logged out with a new user
+            done += 1
+    finally:
+        user.close()
+        results.session(vu, started, time.time())
+
+
+# ----------------------
+# Aggregation and output
+# ----------------------
+def latency_stats(seconds):
+    if not seconds:
+        return {}
+    return {
+        "mean": round(statistics.mean(seconds), 4),
+        "p50": round(percentile(seconds, 50), 4),
+        "p90": round(percentile(seconds, 90), 4),
+        "p95": round(percentile(seconds, 95), 4),
+        "p99": round(percentile(seconds, 99), 4),
+        "max": round(max(seconds), 4),
+    }
+
+
+def summarize(results, run_started, run_seconds, bucket=1.0):
+    def group(samples):
+        ok = [s for s in samples if s["ok"]]
+        return {
+            "count": len(samples),
+            "errors": len(samples) - len(ok),
+            "throughput_per_s": round(len(ok) / run_seconds, 3) if run_seconds else 0.0,
+            "latency_s": latency_stats([s["seconds"] for s in ok]),
+        }
+
+    journeys = [{"seconds": j[2], "ok": j[3]} for j in results.journeys]
+    steps = {
+        name: group([{"seconds": s[2], "ok": s[3]} for s in results.steps if s[0] == name])
+        for name in STEPS
+    }
+    timeline = []
+    for i in range(int(run_seconds / bucket) + 1):
+        lo, hi = run_started + i * bucket, run_started + (i + 1) * bucket
+        finished = [j for j in results.journeys if lo <= j[1] + j[2] < hi]
+        timeline.append({
+            "t": round(i * bucket, 1),
+            "active_users": sum(1 for _vu, a, b in results.sessions if a < hi and b >= lo),
+            "journeys": sum(1 for j in finished if j[3]),
+            "errors": sum(1 for j in finished if not j[3]),
+        })
+    errors = {}
+    for j in results.journeys:
+        if j[4]:
+            errors[j[4]] = errors.get(j[4], 0) + 1
+    return {
+        "journeys": group(journeys),
+        "steps": steps,
+        "timeline": timeline,
+        "top_errors": sorted(errors.items(), key=lambda kv: -kv[1])[:10],
+    }
+
+
+def write_charts(report, out_dir):
+    if pyplot is None:
+        return []
+    paths = []
+    steps = [s for s in STEPS if report["steps"][s]["latency_s"]]
+    fig, ax = pyplot.subplots(figsize=(10, 5))
+    width = 0.2
+    for i, pct in enumerate(("p50", "p90", "p95", "p99")):
+        ax.bar([x + i * width for x in range(len(steps))], [report["steps"][s]["latency_s"][pct] for s in steps],
+               width, label=pct)
+    ax.set_xticks([x + 1.5 * width for x in range(len(steps))], steps, rotation=30)
+    ax.set_ylabel("seconds")
+    ax.set_title("Step latency percentiles")
+    ax.legend()
+    fig.tight_layout()
+    paths.append(out_dir / "load_step_latency.png")
+    fig.savefig(paths[-1])
+
+    timeline = report["timeline"]
+    fig, ax = pyplot.subplots(figsize=(10, 5))
+    t = [p["t"] for p in timeline]
+    ax.plot(t, [p["journeys"] for p in timeline], label="journeys / s")
+    ax.plot(t, [p["errors"] for p in timeline], label="errors / s")
+    ax2 = ax.twinx()
+    ax2.step(t, [p["active_users"] for p in timeline], color="grey", where="post", label="active users")
+    ax.set_xlabel("seconds since start")
+    ax.set_title("Throughput over time")
+    ax.legend(loc="upper left")
+    ax2.legend(loc="upper right")
+    fig.tight_layout()
+    paths.append(out_dir / "load_timeline.png")
+    fig.savefig(paths[-1])
+    pyplot.close("all")
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("http", "browser"), default="http")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--ramp-up", type=float, default=10.0, help="seconds until every user has started")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds of load, ramp-up included")
+    parser.add_argument("--iterations", type=int, default=0, help="journeys per user (0 = until --duration)")
+    parser.add_argument("--profile", default="ci-fast", help="driver profile for --mode browser")
+    parser.add_argument("--page-latency-ms", type=float, default=0)
+    parser.add_argument("--api-latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR)
+    args = parser.parse_args(argv)
+
+    server = StandInServer(
+        page_latency_ms=args.page_latency_ms, api_latency_ms=args.api_latency_ms, jitter_ms=args.jitter_ms
+    ).start()
+    utils.use_site(server.url, server.api_url)
+    results = Results()
+    run_started = time.time()
+    stop_at = run_started + args.duration
+    step = args.ramp_up / args.users if args.users else 0
+    threads = [
+        threading.Thread(
+            target=virtual_user, args=(vu, args, results, run_started + vu * step, stop_at), name=f"vu-{vu}"
+        )
+        for vu in range(args.users)
+    ]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.stop()
+    run_seconds = time.time() - run_started
+
+    report = {
+        "config": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+        "run_seconds": round(run_seconds, 2),
+    }
+    report.update(summarize(results, run_started, run_seconds))
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    (args.output_dir / "load.json").write_text(json.dumps(report, indent=2))
+    charts = write_charts(report, args.output_dir)
+
+    j = report["journeys"]
+    print(f"{args.mode} load: {args.users} users, {run_seconds:.0f}s")
+    print(f"journeys  {j['count']:5} ok {j['count'] - j['errors']:5} errors {j['errors']:4}  "
+          f"{j['throughput_per_s']:.2f}/s  p95 {j['latency_s'].get('p95', 0):.3f}s")
+    for name in STEPS:
+        s = report["steps"][name]
+        if s["count"]:
+            print(f"  {name:12} {s['count']:5} errors {s['errors']:4}  p50 {s['latency_s'].get('p50', 0):.3f}s  "
+                  f"p95 {s['latency_s'].get('p95', 0):.3f}s  p99 {s['latency_s'].get('p99', 0):.3f}s")
+    print(f"results: {args.output_dir / 'load.json'}" + (f" (+{len(charts)} charts)" if charts else ""))
+    return 1 if j["count"] and j["errors"] == j["count"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+Benchmark the framework's representative flows against the local stand-in.
+
+Each flow runs --repeat times; we keep the median wall time, WebDriver
+command count (tests/profiler.py), browser start time and peak browser
+memory. Results are compared with a stored baseline: slower than
+--threshold (relative), or more than --threshold more WebDriver commands
+(polled waits make the count vary a little between runs), is a regression
+and the script exits 1.
+
+    python -m benchmarks.run                       # compare with benchmarks/baseline.json
+    python -m benchmarks.run --save-baseline       # record a new baseline
+    python -m benchmarks.run --flows login cart_read --repeat 10 --api-latency-ms 50
+    python -m benchmarks.run --startup-profiles ci-fast low-memory
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from tests import driver_profiles, profiler, utils
+from tests.driver_pool import DriverPool
+from tests.pages.home_page import HomePage
+from tests.provisioning import DEFAULT_PASSWORD, seed_cart, signup_via_api
+from tests.stand_in import StandInServer
+
+try:
+    import psutil
+except ImportError:  # optional: peak memory is reported as null without it
+    psutil = None
+
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_BASELINE = HERE / "baseline.json"
+DEFAULT_OUTPUT = utils.ROOT / "reports" / "benchmark.json"
+
+
+def browser_memory_mb(driver):
+    """RSS of chromedriver + all Chrome processes it started, in MB."""
+    if psutil is None:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        procs = [root] + root.children(recursive=True)
+        return sum(p.memory_info().rss for p in procs if p.is_running()) / (1024 * 1024)
+    except (psutil.Error, AttributeError):
+        return None
+
+
+class Bench:
+    """Shared state for flows: one pool, one user, one stand-in."""
+
+    def __init__(self, server):
+        self.server = server
+        self.pool = DriverPool(size=1, max_uses=10_000)
+        self.username = utils.generate_username()
+        signup_via_api(self.username, DEFAULT_PASSWORD)
+
+    def signed_in(self, driver):
+        HomePage(driver).open().login(self.username, DEFAULT_PASSWORD)
+
+
+# ----------------------
+# Flows: each returns nothing and runs on the given (warm) driver.
+# ----------------------
+def flow_login(bench, driver):
+    bench.signed_in(driver)
+
+
+def flow_browse(bench, driver):
+    home = HomePage(driver).open()
+    for category in ("Phones", "Laptops", "Monitors"):
+        home.browse_category(category)
+    home.open()
+    home.next_page_until_changed(home.first_card_name())
+
+
+def flow_cart_read(bench, driver):
+    bench.signed_in(driver)
+    seed_cart(driver, [1, 2, 3, 4, 5, 6], clear=True)
+    cart = HomePage(driver).go_to_cart()
+    assert len(cart.rows()) == 6
+
+
+def flow_checkout(bench, driver):
+    bench.signed_in(driver)
+    seed_cart(driver, [1, 2], clear=True)
+    cart = HomePage(driver).go_to_cart()
+    cart.rows()
+    cart.checkout("Bench", "Country", "City", "4111111111111111", "12", "2030")
+
+
+FLOWS = {
+    "login": flow_login,
+    "browse": flow_browse,
+    "cart_read": flow_cart_read,
+    "checkout": flow_checkout,
+}
+
+
+def measure_startup(bench, repeat):
+    """Cold = launch a new Chrome; warm = reset and reuse a pooled one."""
+    cold, memory = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        driver = utils.make_driver()
+        cold.append(time.perf_counter() - started)
+        utils.open_home(driver)
+        memory.append(browser_memory_mb(driver))
+        driver.quit()
+    warm = []
+    bench.pool.release(bench.pool.acquire())  # make sure one session is warm
+    for _ in range(repeat):
+        started = time.perf_counter()
+        driver = bench.pool.acquire()
+        bench.pool.release(driver)  # includes the reset a test would pay for
+        warm.append(time.perf_counter() - started)
+    peak = max((m for m in memory if m is not None), default=None)
+    return {
+        "startup_cold": {"wall_s": statistics.median(cold), "commands": 0, "peak_mb": peak},
+        "startup_warm": {"wall_s": statistics.median(warm), "commands": 0, "peak_mb": None},
+    }
+
+
+def measure_profile_startup(name, repeat):
+    """Cold start of one named driver profile (tests/driver_profiles.py)."""
+    cold, memory = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        driver = utils.make_driver(profile=name)
+        cold.append(time.perf_counter() - started)
+        utils.open_home(driver)
+        memory.append(browser_memory_mb(driver))
+        driver.quit()
+    peak = max((m for m in memory if m is not None), default=None)
+    return {"wall_s": statistics.median(cold), "commands": 0, "peak_mb": peak}
+
+
+def measure_flow(bench, name, repeat):
+    walls, commands, peaks = [], [], []
+    for _ in range(repeat):
+        driver = bench.pool.acquire()
+        try:
+            profile = profiler.attach(driver)
+            started = time.perf_counter()
+            FLOWS[name](bench, driver)
+            walls.append(time.perf_counter() - started)
+            commands.append(profile.total)
+            peaks.append(browser_memory_mb(driver))
+        finally:
+            bench.pool.release(driver)
+    peak = max((p for p in peaks if p is not None), default=None)
+    return {"wall_s": statistics.median(walls), "commands": int(statistics.median(commands)), "peak_mb": peak}
+
+
+def compare(results, baseline, threshold):
+    """Return human-readable regression lines (empty = all good)."""
+    problems = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        if current["wall_s"] > before["wall_s"] * (1 + threshold):
+            problems.append(f"{name}: wall {before['wall_s']:.2f}s -> {current['wall_s']:.2f}s")
+        if current["commands"] > before["commands"] * (1 + threshold):
+            problems.append(f"{name}: commands {before['commands']} -> {current['commands']}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flows", nargs="*", default=list(FLOWS), choices=list(FLOWS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown and command growth (0.2 = 20%%)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--page-latency-ms", type=float, default=0)
+    parser.add_argument("--api-latency-ms", type=float, default=0)
+    parser.add_argument(
+        "--startup-profiles", nargs="*", default=[], choices=list(driver_profiles.PROFILES),
+        help="also time a cold start of these driver profiles (startup_cold[<name>])",
+    )
+    args = parser.parse_args(argv)
+
+    server = StandInServer(page_latency_ms=args.page_latency_ms, api_latency_ms=args.api_latency_ms).start()
+    utils.use_site(server.url, server.api_url)
+    bench = Bench(server)
+    try:
+        results = measure_startup(bench, args.repeat)
+        for name in args.startup_profiles:
+            results[f"startup_cold[{name}]"] = measure_profile_startup(name, args.repeat)
+        for name in args.flows:
+            results[name] = measure_flow(bench, name, args.repeat)
+    finally:
+        bench.pool.close()
+        server.stop()
+
+    for name, r in results.items():
+        peak = f"{r['peak_mb']:.0f}MB" if r["peak_mb"] is not None else "n/a"
+        print(f"{name:24} wall {r['wall_s']:.3f}s  commands {r['commands']:4}  peak {peak}")
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2))
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --save-baseline first")
+        return 0
+    problems = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+    for line in problems:
+        print(f"REGRESSION {line}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Diff the WebDriver command traces of two test runs (tests/traces.py).
+
+Commands are grouped per test into steps: (helper, command, locator). For
+every test recorded in both runs the report lists
+
+- added / removed commands   a step issued more (or fewer) times than before
+- slower steps               total time of a step grew by --min-ms and --ratio
+- extra waits                more in-page waits (async scripts) or longer
+                             poll loops (the same step repeated back to back)
+
+    python -m benchmarks.trace_diff                          # the two latest runs
+    python -m benchmarks.trace_diff 20240501-101500 20240502-093000
+    python -m benchmarks.trace_diff OLD NEW -k cart --min-ms 100 --json reports/trace_diff.json
+
+Record runs with COMMAND_TRACE=1. Runs are names under reports/traces/ or paths. Exit code 1 when any test
+gained commands, slower steps or waits (for CI), 0 otherwise.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from tests import traces
+
+
+WAIT_COMMANDS = {"w3cExecuteScriptAsync", "executeAsyncScript"}
+
+
+def resolve(run) -> Path:
+    path = Path(run)
+    if path.is_dir():
+        return path
+    path = traces.TRACE_DIR / run
+    if not path.is_dir():
+        raise SystemExit(f"no trace run {run!r} (looked in {traces.TRACE_DIR})")
+    return path
+
+
+def steps(records) -> dict:
+    """(helper, command, locator) -> {count, ms, waits, polls, longest_poll}."""
+    out = {}
+    previous, streak = None, 0
+    for record in records:
+        key = (record["helper"], record["command"], record["locator"])
+        step = out.setdefault(key, {"count": 0, "ms": 0.0, "waits": 0, "polls": 0, "longest_poll": 0})
+        step["count"] += 1
+        step["ms"] += record["ms"]
+        if record["command"] in WAIT_COMMANDS:
+            step["waits"] += 1
+        streak = streak + 1 if key == previous else 1
+        if streak > 1:
+            step["polls"] += 1
+            step["longest_poll"] = max(step["longest_poll"], streak)
+        previous = key
+    return out
+
+
+def label(key) -> str:
+    helper, command, locator = key
+    return f"{helper} {command}" + (f" {locator}" if locator else "")
+
+
+def diff_test(old, new, min_ms: float, ratio: float) -> dict:
+    before, after = steps(old), steps(new)
+    empty = {"count": 0, "ms": 0.0, "waits": 0, "polls": 0, "longest_poll": 0}
+    result = {
+        "commands": [len(old), len(new)],
+        "ms": [round(sum(r["ms"] for r in old), 1), round(sum(r["ms"] for r in new), 1)],
+        "added": [],
+        "removed": [],
+        "slower": [],
+        "waits": [],
+    }
+    for key in sorted(set(before) | set(after)):
+        a, b = before.get(key, empty), after.get(key, empty)
+        if b["count"] > a["count"]:
+            result["added"].append({"step": label(key), "was": a["count"], "now": b["count"]})
+        elif b["count"] < a["count"]:
+            result["removed"].append({"step": label(key), "was": a["count"], "now": b["count"]})
+        grew = b["ms"] - a["ms"]
+        if a["count"] and b["count"] and grew >= min_ms and b["ms"] >= a["ms"] * ratio:
+            result["slower"].append({"step": label(key), "was_ms": round(a["ms"], 1), "now_ms": round(b["ms"], 1)})
+        if b["waits"] > a["waits"] or b["polls"] > a["polls"]:
+            result["waits"].append(
+                {
+                    "step": label(key),
+                    "was": {"waits": a["waits"], "polls": a["polls"], "longest_poll": a["longest_poll"]},
+                    "now": {"waits": b["waits"], "polls": b["polls"], "longest_poll": b["longest_poll"]},
+                }
+            )
+    result["slower"].sort(key=lambda s: s["was_ms"] - s["now_ms"])
+    return result
+
+
+def diff_runs(old: dict, new: dict, min_ms: float = 50, ratio: float = 1.2, match: str = None) -> dict:
+    names = sorted(name for name in set(old) | set(new) if not match or match in name)
+    report = {"tests": {}, "only_old": [], "only_new": []}
+    for name in names:
+        if name not in new:
+            report["only_old"].append(name)
+        elif name not in old:
+            report["only_new"].append(name)
+        else:
+            report["tests"][name] = diff_test(old[name], new[name], min_ms, ratio)
+    return report
+
+
+def regressed(result) -> bool:
+    return bool(result["added"] or result["slower"] or result["waits"])
+
+
+def print_report(report, old_name, new_name, show_all=False):
+    print(f"trace diff {old_name} -> {new_name}")
+    changed = 0
+    for name, result in report["tests"].items():
+        if not (show_all or regressed(result) or result["removed"]):
+            continue
+        changed += 1
+        (c0, c1), (t0, t1) = result["commands"], result["ms"]
+        print(f"\n{name}\n  commands {c0} -> {c1} ({c1 - c0:+d}), command time {t0:.0f}ms -> {t1:.0f}ms")
+        for step in result["added"]:
+            print(f"  + {step['step']}  x{step['was']} -> x{step['now']}")
+        for step in result["removed"]:
+            print(f"  - {step['step']}  x{step['was']} -> x{step['now']}")
+        for step in result["slower"]:
+            print(f"  ~ slower {step['step']}  {step['was_ms']:.0f}ms -> {step['now_ms']:.0f}ms")
+        for step in result["waits"]:
+            was, now = step["was"], step["now"]
+            kind = "new poll loop" if now["polls"] and not was["polls"] else "extra waits"
+            print(
+                f"  ! {kind} {step['step']}  waits {was['waits']} -> {now['waits']}, "
+                f"repeats {was['polls']} -> {now['polls']} (longest x{was['longest_poll']} -> x{now['longest_poll']})"
+            )
+    if report["only_old"]:
+        print(f"\nonly in {old_name}: {len(report['only_old'])} tests")
+    if report["only_new"]:
+        print(f"only in {new_name}: {len(report['only_new'])} tests")
+    print(f"\n{changed} of {len(report['tests'])} common tests changed")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("runs", nargs="*", help="OLD NEW (default: the two latest runs)")
+    parser.add_argument("-k", dest="match", help="only tests whose node id contains this")
+    parser.add_argument("--min-ms", type=float, default=50, help="ignore steps that grew by less than this")
+    parser.add_argument("--ratio", type=float, default=1.2, help="slower = new time >= old time x ratio")
+    parser.add_argument("--all", action="store_true", help="also list unchanged tests")
+    parser.add_argument("--json", type=Path, help="also write the diff here")
+    args = parser.parse_args(argv)
+
+    if len(args.runs) == 2:
+        old_dir, new_dir = (resolve(run) for run in args.runs)
+    elif not args.runs:
+        recorded = traces.runs()
+        if len(recorded) < 2:
+            parser.error(
+                f"need two recorded runs in {traces.TRACE_DIR}, found {len(recorded)} (run pytest with COMMAND_TRACE=1)"
+            )
+        old_dir, new_dir = recorded[-2:]
+    else:
+        parser.error("give two runs (OLD NEW) or none")
+
+    report = diff_runs(traces.load(old_dir), traces.load(new_dir), args.min_ms, args.ratio, args.match)
+    print_report(report, old_dir.name, new_dir.name, args.all)
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(report, indent=2))
+    return 1 if any(regressed(result) for result in report["tests"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Opt-in in-page alert capture.
+
+The site reports signup, login errors, contact and add-to-cart through
+native `alert()`. Handling a native alert costs a polled wait plus separate
+`.text` and `.accept()` round trips, and the open dialog blocks the page.
+
+In capture mode a script registered with `Page.addScriptToEvaluateOnNewDocument`
+replaces `window.alert` before any site script runs: messages are pushed
+onto a queue in sessionStorage (so they survive same-origin reloads) and the
+call returns at once. `next_message` waits for and pops a message in one
+in-page script call.
+
+The native path stays the default. Pick capture with ALERT_MODE=capture or
+@pytest.mark.capture_alerts; @pytest.mark.native_alerts forces native
+dialogs for tests that need real browser behaviour.
+"""
+
+import os
+
+from . import waits
+
+
+QUEUE_KEY = "__captured_alerts"
+
+_HOOK_JS = """
+(function () {
+    if (window.__alertHooked) return;
+    window.__alertHooked = true;
+    window.__nativeAlert = window.alert;
+    window.alert = function (message) {
+        var key = '%(key)s';
+        var queue = JSON.parse(sessionStorage.getItem(key) || '[]');
+        queue.push(message === undefined ? '' : String(message));
+        sessionStorage.setItem(key, JSON.stringify(queue));
+    };
+})();
+""" % {"key": QUEUE_KEY}
+
+_UNHOOK_JS = """
+if (window.__alertHooked) {
+    window.alert = window.__nativeAlert;
+    window.__alertHooked = false;
+}
+"""
+
+# Pops the oldest message; wrapped so an empty alert('') is still truthy.
+_POP_JS = """
+var queue = JSON.parse(sessionStorage.getItem(args[0]) || '[]');
+if (!queue.length) return null;
+var message = queue.shift();
+sessionStorage.setItem(args[0], JSON.stringify(queue));
+return {text: message};
+"""
+
+_DRAIN_JS = """
+var key = arguments[0];
+var queue = JSON.parse(sessionStorage.getItem(key) || '[]');
+sessionStorage.removeItem(key);
+return queue;
+"""
+
+
+def default_mode() -> str:
+    return os.getenv("ALERT_MODE", "native").lower()
+
+
+def is_captured(driver) -> bool:
+    return getattr(driver, "_alert_hook_id", None) is not None
+
+
+def install(driver):
+    """Capture alerts in this browser from now on (current page included)."""
+    if is_captured(driver):
+        return
+    result = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _HOOK_JS})
+    driver._alert_hook_id = result["identifier"]
+    driver.execute_script(_HOOK_JS)
+
+
+def reinstall(driver):
+    """Hook a new tab again: scripts added for new documents belong to the old tab."""
+    if is_captured(driver):
+        driver._alert_hook_id = None
+        install(driver)
+
+
+def uninstall(driver):
+    """Back to native dialogs (new documents and the current page)."""
+    if not is_captured(driver):
+        return
+    driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": driver._alert_hook_id})
+    driver._alert_hook_id = None
+    driver.execute_script(_UNHOOK_JS)
+
+
+def next_message(driver, timeout=None) -> str:
+    """Wait for the next captured alert and return its text."""
+    found = waits.until_js(
+        driver,
+        _POP_JS,
+        [QUEUE_KEY],
+        timeout,
+        "no alert",
+        lambda d: d.execute_script("var args = arguments[0];" + _POP_JS, [QUEUE_KEY]),
+        key="captured alert",
+    )
+    return found["text"]
+
+
+def drain(driver) -> list:
+    """Every captured message not read yet (clears the queue)."""
+    return driver.execute_script(_DRAIN_JS, QUEUE_KEY) or []
@@ -0,0 +1,159 @@
+"""
+Background screenshot/artifact pipeline.
+
+The test thread only grabs the PNG bytes from the browser. Hashing,
+optional re-compression, de-duplication, disk writes and quota eviction run
+on a small worker pool. Allure attachments are added when the test tears
+down (`finish_test`) without waiting for the pool: the stored file if it is
+already written, the captured bytes otherwise. Screenshots taken outside a
+test (session fixture setup) are attached right away. The pool is drained
+once, at session end.
+
+Knobs (environment variables):
+- ARTIFACT_MODE      always (default) | on_failure | off
+- ARTIFACT_WORKERS   background threads (default 2)
+- ARTIFACT_QUOTA_MB  cap for screenshots/ shared by all xdist workers (flock); oldest
+                     files are evicted (default 200). In on_failure mode it also caps
+                     the screenshots a test holds in memory until it is known to fail
+- ARTIFACT_OPTIMIZE  1 = re-encode PNGs with Pillow's optimizer (if installed)
+"""
+
+import fcntl
+import hashlib
+import io
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import allure
+
+try:
+    from PIL import Image
+except ImportError:  # optional: only used when ARTIFACT_OPTIMIZE=1
+    Image = None
+
+
+SCREENSHOTS_DIR = Path(__file__).resolve().parent.parent / "screenshots"
+
+
+def _safe(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name)[:80]
+
+
+class ArtifactPipeline:
+    """Owns the worker pool, the on-disk index and per-test pending attachments."""
+
+    def __init__(self, directory: Path = SCREENSHOTS_DIR):
+        self.directory = directory
+        self.mode = os.getenv("ARTIFACT_MODE", "always").lower()
+        self.quota = int(float(os.getenv("ARTIFACT_QUOTA_MB", "200")) * 1024 * 1024)
+        self.optimize = os.getenv("ARTIFACT_OPTIMIZE") == "1" and Image is not None
+        self._executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("ARTIFACT_WORKERS", "2")), thread_name_prefix="artifacts"
+        )
+        self._lock = threading.Lock()
+        self._by_hash = {}  # sha256 -> Path already written
+        self._futures = []
+        self.current_test = None
+        self._pending = {}  # nodeid -> [(name, png, future)]
+        self._buffered = {}  # nodeid -> [(name, png)] in on_failure mode
+
+    # ---- test thread ----
+    def capture(self, driver, name: str):
+        """Grab a screenshot; everything after the bytes happens in the background."""
+        if self.mode == "off":
+            return
+        png = driver.get_screenshot_as_png()
+        if self.mode == "on_failure" and self.current_test is not None:
+            buffered = self._buffered.setdefault(self.current_test, [])
+            buffered.append((name, png))
+            while len(buffered) > 1 and sum(len(shot) for _, shot in buffered) > self.quota:
+                buffered.pop(0)  # keep the latest shots within the quota
+            return
+        self._submit(self.current_test, name, png)
+
+    def finish_test(self, nodeid: str, failed: bool):
+        """Attach this test's artifacts to Allure (or drop them in on_failure mode); never waits on writes."""
+        for name, png in self._buffered.pop(nodeid, []):
+            if failed:
+                self._submit(nodeid, name, png)
+        for name, png, future in self._pending.pop(nodeid, []):
+            self._attach(name, png, future)
+
+    def _attach(self, name, png, future=None):
+        if future is not None and future.done() and future.exception() is None:
+            try:
+                allure.attach.file(str(future.result()), name=name, attachment_type=allure.attachment_type.PNG)
+                return
+            except FileNotFoundError:  # evicted by the quota (possibly by another worker)
+                pass
+        allure.attach(png, name=name, attachment_type=allure.attachment_type.PNG)
+
+    def flush(self):
+        """Wait for every queued write (call at session end)."""
+        with self._lock:
+            futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def close(self):
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _submit(self, nodeid, name, png):
+        future = self._executor.submit(self._store, name, png)
+        with self._lock:
+            self._futures.append(future)
+        if nodeid is None:  # no test to attach to later (e.g. a session fixture's setup)
+            self._attach(name, png)
+        else:
+            self._pending.setdefault(nodeid, []).append((name, png, future))
+
+    # ---- worker threads ----
+    def _store(self, name: str, png: bytes) -> Path:
+        if self.optimize:
+            out = io.BytesIO()
+            Image.open(io.BytesIO(png)).save(out, format="PNG", optimize=True)
+            png = out.getvalue()
+        digest = hashlib.sha256(png).hexdigest()
+        with self._lock:
+            existing = self._by_hash.get(digest)
+            if existing is not None and existing.exists():
+                return existing
+            path = self.directory / f"{_safe(name)}-{digest[:12]}.png"
+            self._by_hash[digest] = path
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(png)
+        self._account(path)
+        return path
+
+    def _on_disk(self):
+        """[(path, bytes)] of every screenshot, oldest first (files other workers wrote included)."""
+        files = []
+        for path in self.directory.glob("*.png"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, path, stat.st_size))
+        return [(path, size) for _mtime, path, size in sorted(files)]
+
+    def _account(self, path: Path):
+        """Evict the oldest files until screenshots/ fits the quota; one worker at a time."""
+        with self._lock, open(self.directory / ".quota.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            files = self._on_disk()
+            total = sum(size for _path, size in files)
+            for oldest, size in files:
+                if total <= self.quota:
+                    break
+                if oldest == path:
+                    continue
+                oldest.unlink(missing_ok=True)
+                total -= size
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+PIPELINE = ArtifactPipeline()
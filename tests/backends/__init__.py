@@ -0,0 +1,18 @@
+"""
+Browser backends behind the page objects.
+
+- SeleniumBackend (default): the blocking Selenium API, used by BasePage and
+  every sync helper in tests/utils.py.
+- CdpBrowser / CdpSession: asyncio, speaking the Chrome DevTools protocol
+  over one websocket (needs the optional `websockets` package). Used by the
+  Async* page objects; many sessions run concurrently in one event loop.
+
+Both expose the same primitives - goto, click, fill, fill_form,
+wait_visible, wait_text_in, read_text, extract, next_alert, current_url -
+sync on the Selenium side, coroutines on the CDP side.
+"""
+
+from .cdp import CdpBrowser, CdpError, CdpSession
+from .selenium_backend import SeleniumBackend
+
+__all__ = ["CdpBrowser", "CdpError", "CdpSession", "SeleniumBackend"]
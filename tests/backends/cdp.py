@@ -0,0 +1,407 @@
+"""
+Asyncio backend that drives Chrome over the DevTools protocol directly.
+
+No chromedriver and no HTTP hop per command: one websocket to the browser,
+commands are JSON messages matched to their replies by id, and every page
+gets its own session on that socket. A browser hosts many sessions, each in
+its own browser context (separate cookies/storage, like separate
+profiles), so one event loop can drive dozens of users at once:
+
+    async with await CdpBrowser.launch() as browser:
+        sessions = [await browser.new_session() for _ in range(10)]
+        await asyncio.gather(*(journey(s) for s in sessions))
+
+Waits reuse the in-page wait script from tests/waits.py (wrapped in a
+Promise) and take their budgets from the adaptive timeout service, so sync
+and async runs share one latency history. Native dialogs are accepted as
+they open and their text is queued for `next_alert`.
+
+Needs the optional `websockets` package; chromedriver is never started.
+Launch options come from tests/driver_profiles.py (DRIVER_PROFILE). A
+profile template (tests/profile_templates.py) is cloned only if a Selenium
+run already built a fresh one for this site; otherwise Chrome starts from an
+empty user-data dir. Chrome is found through CHROME_BINARY or PATH;
+CDP_LAUNCH_TIMEOUT_S (default 20) bounds the launch.
+"""
+
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from selenium.common.exceptions import TimeoutException
+
+from .. import driver_profiles, profile_templates, scripts, utils, waits
+from ..timeouts import SERVICE
+
+try:
+    import websockets
+except ImportError:  # optional: only the async backend needs it
+    websockets = None
+
+
+CHROME_NAMES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+PORT_FILE = "DevToolsActivePort"
+
+# The page navigated while a script was running: try again in the new document
+_NAVIGATION_ERRORS = (
+    "Execution context was destroyed",
+    "Cannot find context with specified id",
+    "Inspected target navigated or closed",
+    "Promise was collected",
+)
+
+# In-page checks for click/visibility. Element handles cannot cross the
+# socket by value, so they return the element's centre instead. A click
+# target must also hold still for two probes (modals slide in) and not be
+# covered by something else at that point.
+_VISIBLE_JS = """
+var el = __find(args[0], args[1]);
+if (!__visible(el)) return null;
+var r = el.getBoundingClientRect();
+return {x: r.left + r.width / 2, y: r.top + r.height / 2};
+"""
+
+_CLICKABLE_JS = """
+var el = __find(args[0], args[1]);
+if (!__visible(el) || el.disabled) return null;
+var r = el.getBoundingClientRect();
+if (r.bottom < 0 || r.top > innerHeight || r.right < 0 || r.left > innerWidth) {
+    el.scrollIntoView({block: 'center', inline: 'center'});
+    return null;
+}
+var x = r.left + r.width / 2, y = r.top + r.height / 2;
+var rect = [x, y, r.width, r.height].join();
+if (el.__rect !== rect) { el.__rect = rect; return null; }
+var hit = document.elementFromPoint(x, y);
+return (hit && (hit === el || el.contains(hit))) ? {x: x, y: y} : null;
+"""
+
+
+class CdpError(RuntimeError):
+    """The browser answered a command with an error (or went away)."""
+
+
+def chrome_binary() -> str:
+    binary = os.getenv("CHROME_BINARY") or next(filter(None, map(shutil.which, CHROME_NAMES)), None)
+    if not binary:
+        raise CdpError("Chrome not found: set CHROME_BINARY or put google-chrome/chromium on PATH")
+    return binary
+
+
+def _call(body: str, args) -> str:
+    """Expression running `body` as a function of `args` (seen as `arguments`)."""
+    return "(function () {%s}).apply(null, %s)" % (body, json.dumps(list(args)))
+
+
+class CdpConnection:
+    """One websocket to the browser; commands by id, events by (session, method)."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._listeners = {}
+        self._reader = asyncio.get_running_loop().create_task(self._read())
+
+    async def send(self, method: str, params=None, session_id=None) -> dict:
+        message = {"id": next(self._ids), "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        reply = asyncio.get_running_loop().create_future()
+        self._pending[message["id"]] = reply
+        await self.ws.send(json.dumps(message))
+        return await reply
+
+    def on(self, session_id, method: str, callback):
+        self._listeners.setdefault((session_id, method), []).append(callback)
+
+    def off(self, session_id):
+        for key in [key for key in self._listeners if key[0] == session_id]:
+            del self._listeners[key]
+
+    async def _read(self):
+        try:
+            async for raw in self.ws:
+                message = json.loads(raw)
+                if "id" not in message:
+                    for callback in self._listeners.get((message.get("sessionId"), message.get("method")), ()):
+                        callback(message.get("params", {}))
+                    continue
+                reply = self._pending.pop(message["id"], None)
+                if reply is None or reply.done():
+                    continue
+                if "error" in message:
+                    reply.set_exception(CdpError(message["error"].get("message", str(message["error"]))))
+                else:
+                    reply.set_result(message.get("result", {}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for reply in self._pending.values():
+                if not reply.done():
+                    reply.set_exception(CdpError("browser connection closed"))
+            self._pending.clear()
+
+    async def close(self):
+        await self.ws.close()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._reader
+
+
+class CdpBrowser:
+    """A Chrome process and its DevTools connection; hands out sessions."""
+
+    def __init__(self, process, connection, data_dir):
+        self.process = process
+        self.connection = connection
+        self.data_dir = data_dir
+        self.sessions = []
+
+    @classmethod
+    async def launch(cls, profile=None):
+        if websockets is None:
+            raise CdpError("the async backend needs the `websockets` package (pip install websockets)")
+        started = time.perf_counter()
+        name = driver_profiles.profile_name(profile)
+        spec = driver_profiles.PROFILES[name]
+        data_dir = profile_templates.existing_session_dir(name, utils.BASE_URL) or tempfile.mkdtemp(
+            prefix="chrome-profile-", dir=driver_profiles.user_data_root(name)
+        )
+        port_file = os.path.join(data_dir, PORT_FILE)
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(port_file)  # a template may carry its builder's port
+        args = [chrome_binary(), "--remote-debugging-port=0", f"--user-data-dir={data_dir}"]
+        if spec["headless"]:
+            args.append("--headless=new")
+        if spec["window"]:
+            args.append("--window-size={},{}".format(*spec["window"]))
+        else:
+            args.append("--start-maximized")
+        args += spec["args"] + ["about:blank"]
+        process = await asyncio.create_subprocess_exec(
+            *args, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
+        )
+        try:
+            url = await cls._devtools_url(process, port_file)
+            connection = CdpConnection(await websockets.connect(url, max_size=None))
+        except BaseException:
+            with contextlib.suppress(ProcessLookupError):
+                process.kill()
+            shutil.rmtree(data_dir, ignore_errors=True)
+            raise
+        driver_profiles.STARTUP.add(f"{name} (cdp)", time.perf_counter() - started)
+        return cls(process, connection, data_dir)
+
+    @staticmethod
+    async def _devtools_url(process, port_file) -> str:
+        deadline = time.monotonic() + float(os.getenv("CDP_LAUNCH_TIMEOUT_S", "20"))
+        while time.monotonic() < deadline:
+            if process.returncode is not None:
+                raise CdpError(f"Chrome exited during launch (code {process.returncode})")
+            try:
+                port, path = open(port_file).read().split()[:2]
+                return f"ws://127.0.0.1:{port}{path}"
+            except (OSError, ValueError):  # not written (completely) yet
+                await asyncio.sleep(0.05)
+        raise CdpError("Chrome did not open its DevTools port in time")
+
+    async def new_session(self):
+        """A fresh tab in its own browser context (no shared cookies/storage)."""
+        send = self.connection.send
+        context = (await send("Target.createBrowserContext", {"disposeOnDetach": True}))["browserContextId"]
+        target = (await send("Target.createTarget", {"url": "about:blank", "browserContextId": context}))["targetId"]
+        session_id = (await send("Target.attachToTarget", {"targetId": target, "flatten": True}))["sessionId"]
+        session = CdpSession(self.connection, session_id, target, context)
+        await session.start()
+        self.sessions.append(session)
+        return session
+
+    async def close(self):
+        for session in list(self.sessions):
+            with contextlib.suppress(CdpError):
+                await session.close()
+        with contextlib.suppress(CdpError, asyncio.TimeoutError):
+            await asyncio.wait_for(self.connection.send("Browser.close"), 5)
+        await self.connection.close()
+        try:
+            await asyncio.wait_for(self.process.wait(), 5)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+class CdpSession:
+    """Async primitives for one tab; mirrors SeleniumBackend."""
+
+    def __init__(self, connection, session_id, target_id, context_id):
+        self.connection = connection
+        self.session_id = session_id
+        self.target_id = target_id
+        self.context_id = context_id
+        self.closed = False
+        self._loaded = asyncio.Event()
+        self._dialogs = asyncio.Queue()
+
+    async def send(self, method: str, params=None) -> dict:
+        return await self.connection.send(method, params, self.session_id)
+
+    async def start(self):
+        self.connection.on(self.session_id, "Page.loadEventFired", lambda params: self._loaded.set())
+        self.connection.on(self.session_id, "Page.javascriptDialogOpening", self._on_dialog)
+        await self.send("Page.enable")
+
+    def _on_dialog(self, params):
+        # An open dialog blocks every script in the page: accept it right away
+        self._dialogs.put_nowait(params.get("message", ""))
+        asyncio.ensure_future(self.send("Page.handleJavaScriptDialog", {"accept": True}))
+
+    async def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.connection.off(self.session_id)
+        await self.connection.send("Target.closeTarget", {"targetId": self.target_id})
+        await self.connection.send("Target.disposeBrowserContext", {"browserContextId": self.context_id})
+
+    # ---- scripts ----
+    async def evaluate(self, expression: str, await_promise: bool = False):
+        result = await self.send(
+            "Runtime.evaluate", {"expression": expression, "returnByValue": True, "awaitPromise": await_promise}
+        )
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            raise CdpError(details.get("exception", {}).get("description") or details.get("text", "script error"))
+        return result["result"].get("value")
+
+    async def call(self, body: str, *args):
+        """Run `body` as a function body; it sees `args` through `arguments`."""
+        return await self.evaluate(_call(body, args))
+
+    async def wait_js(self, body: str, args=None, timeout=None, message="", key=None):
+        """
+        Async counterpart of waits.until_js: `body` runs inside the page on
+        every DOM change until it returns something truthy. Survives
+        navigations by starting over in the new document.
+        """
+        key = key or message
+        budget = SERVICE.timeout_for(key, timeout)
+        started = time.monotonic()
+        result = None
+        try:
+            while True:
+                remaining = budget - (time.monotonic() - started)
+                if remaining <= 0:
+                    break
+                script = (
+                    "new Promise(function (resolve) { (function () {%s}).apply(null, [%s, %d, resolve]); })"
+                    % (scripts.ASYNC_WAIT_JS.replace("/*CHECK*/", body), json.dumps(args or []), remaining * 1000)
+                )
+                try:
+                    result = await asyncio.wait_for(self.evaluate(script, await_promise=True), remaining + 5)
+                    break
+                except CdpError as exc:
+                    if not any(marker in str(exc) for marker in _NAVIGATION_ERRORS):
+                        raise
+                    await asyncio.sleep(0.05)
+                except asyncio.TimeoutError:
+                    break
+        finally:
+            waits.STATS.record("in-page", time.monotonic() - started)
+        if not result:
+            SERVICE.record(key, time.monotonic() - started, ok=False)
+            raise TimeoutException(message)
+        SERVICE.record(key, time.monotonic() - started)
+        return result
+
+    # ---- primitives (same names as SeleniumBackend) ----
+    async def goto(self, url: str, timeout=None):
+        key = "page load"
+        budget = SERVICE.timeout_for(key, timeout)
+        started = time.monotonic()
+        self._loaded.clear()
+        result = await self.send("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            raise CdpError(f"navigation to {url} failed: {result['errorText']}")
+        try:
+            await asyncio.wait_for(self._loaded.wait(), budget)
+        except asyncio.TimeoutError:
+            SERVICE.record(key, time.monotonic() - started, ok=False)
+            raise TimeoutException(f"{url} did not load") from None
+        SERVICE.record(key, time.monotonic() - started)
+
+    async def current_url(self) -> str:
+        return await self.evaluate("location.href")
+
+    async def wait_visible(self, locator, timeout=None):
+        return await self.wait_js(_VISIBLE_JS, list(locator), timeout, f"{locator} not visible")
+
+    async def click(self, locator, timeout=None):
+        point = await self.wait_js(_CLICKABLE_JS, list(locator), timeout, f"{locator} not clickable")
+        for kind in ("mousePressed", "mouseReleased"):
+            await self.send(
+                "Input.dispatchMouseEvent",
+                {"type": kind, "x": point["x"], "y": point["y"], "button": "left", "clickCount": 1},
+            )
+
+    async def fill_form(self, fields, timeout=None):
+        """Fill `{locator: value}` in one in-page wait (same script as utils.fill_form)."""
+        await self.wait_js(
+            scripts.FILL_JS,
+            [[[by, value, str(text)] for (by, value), text in fields.items()]],
+            timeout,
+            "form fields not visible: " + ", ".join(str(locator) for locator in fields),
+        )
+
+    async def fill(self, locator, text, timeout=None):
+        await self.fill_form({locator: text}, timeout)
+
+    async def wait_text_in(self, locator, text, timeout=None):
+        await self.wait_js(
+            "var el = __find(args[0], args[1]); return !!el && el.innerText.indexOf(args[2]) !== -1;",
+            [locator[0], locator[1], text],
+            timeout,
+            f"{text!r} not in {locator}",
+            key=f"text in {locator}",
+        )
+
+    async def wait_url_contains(self, fragment: str, timeout=None, message=""):
+        await self.wait_js(
+            "return location.href.indexOf(args[0]) !== -1;",
+            [fragment],
+            timeout,
+            message or f"url has no {fragment!r}",
+        )
+
+    async def read_text(self, css: str) -> str:
+        return await self.call(
+            "var el = document.querySelector(arguments[0]); return el ? el.innerText.trim() : '';", css
+        )
+
+    async def extract(self, css: str, fields: dict):
+        """utils.extract without element handles (they cannot leave the page)."""
+        return await self.call(scripts.EXTRACT_JS, css, fields, False)
+
+    async def next_alert(self, timeout=None) -> str:
+        """Text of the next dialog (already accepted when it opened)."""
+        key = "no alert"
+        budget = SERVICE.timeout_for(key, timeout)
+        started = time.monotonic()
+        try:
+            text = await asyncio.wait_for(self._dialogs.get(), budget)
+        except asyncio.TimeoutError:
+            SERVICE.record(key, time.monotonic() - started, ok=False)
+            raise TimeoutException("no alert") from None
+        SERVICE.record(key, time.monotonic() - started)
+        return text
@@ -0,0 +1,49 @@
+"""
+Default backend: blocking Selenium calls through tests/utils.py and tests/waits.py.
+"""
+
+from .. import utils, waits
+
+
+class SeleniumBackend:
+    """Sync primitives over one WebDriver session."""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def goto(self, url):
+        self.driver.get(url)
+
+    def current_url(self) -> str:
+        return self.driver.current_url
+
+    # Element waits return WebElements so BasePage can cache them
+    def clickable(self, locator, timeout=None):
+        return waits.clickable(self.driver, locator, timeout)
+
+    def visible(self, locator, timeout=None):
+        return waits.visible(self.driver, locator, timeout)
+
+    def click(self, locator, timeout=None):
+        self.clickable(locator, timeout).click()
+
+    def fill(self, locator, text, timeout=None):
+        utils.wait_fill(self.driver, locator, text, timeout)
+
+    def fill_form(self, fields, keystrokes=None, timeout=None):
+        utils.fill_form(self.driver, fields, keystrokes, timeout)
+
+    def wait_visible(self, locator, timeout=None):
+        return self.visible(locator, timeout)
+
+    def wait_text_in(self, locator, text, timeout=None):
+        waits.text_in(self.driver, locator, text, timeout)
+
+    def read_text(self, css):
+        return utils.read_text(self.driver, css)
+
+    def extract(self, css, fields, with_elements=False):
+        return utils.extract(self.driver, css, fields, with_elements)
+
+    def next_alert(self, timeout=None) -> str:
+        return utils.wait_alert_text_and_accept(self.driver, timeout)
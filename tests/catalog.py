@@ -0,0 +1,67 @@
+"""
+Session-wide product catalog built from the site's API.
+
+Instead of clicking into a category and indexing live `#tbodyid .card`
+elements, tests look products up here: one `bycat` request per category
+(sent concurrently) gives every product's id, title, price and category.
+Lookups are in memory; `url` is the product page, so a test can open it
+directly. The index is built once per process and deployment.
+"""
+
+from . import utils
+from .provisioning import fan_out
+
+
+# UI link text -> the `cat` value the API uses
+CATEGORIES = {"Phones": "phone", "Laptops": "notebook", "Monitors": "monitor"}
+
+_catalogs = {}  # API_URL -> Catalog
+
+
+class Catalog:
+    """Products by id, title and category (in the order the site lists them)."""
+
+    def __init__(self, items):
+        self.by_id = {}
+        self.by_title = {}
+        self.by_category = {name: [] for name in CATEGORIES}
+        names = {key: name for name, key in CATEGORIES.items()}
+        for item in items:
+            product = {
+                "id": int(item["id"]),
+                "title": item["title"].strip(),
+                "price": int(round(float(item["price"]))),
+                "category": names.get(item.get("cat"), item.get("cat")),
+                "url": utils.product_url(item["id"]),
+            }
+            self.by_id[product["id"]] = product
+            self.by_title.setdefault(product["title"], product)
+            self.by_category.setdefault(product["category"], []).append(product)
+
+    @classmethod
+    def from_api(cls):
+        """Raises ProvisioningError if the API is unreachable."""
+        bodies = fan_out("bycat", [{"cat": key} for key in CATEGORIES.values()])
+        return cls(item for body in bodies for item in (body or {}).get("Items", []))
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def in_category(self, category: str) -> list:
+        return self.by_category.get(category, [])
+
+    def get(self, product_id) -> dict:
+        return self.by_id[int(product_id)]
+
+    def find(self, title: str) -> dict:
+        return self.by_title[title.strip()]
+
+    def price(self, title: str) -> int:
+        return self.find(title)["price"]
+
+
+def get_catalog() -> Catalog:
+    """The index for the current deployment (built on first use)."""
+    if utils.API_URL not in _catalogs:
+        _catalogs[utils.API_URL] = Catalog.from_api()
+    return _catalogs[utils.API_URL]
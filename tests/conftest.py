@@ -3,21 +3,96 @@ Common fixtures for the Demoblaze test suite.
 """
 
 import os
+import time
+
+import allure
 import pytest
 
+from . import alerts, artifacts, driver_profiles, instrumentation, network, profiler
+from .driver_pool import DriverPool
+from .catalog import get_catalog
+from .pages.base_page import CacheStats
+from .parallel import (
+    WorkerTimings,
+    clear_worker_files,
+    is_controller,
+    is_worker,
+    merge_worker_files,
+    worker_id,
+)
+from . import scheduling, timeouts, traces, utils, waits
+from .provisioning import ProvisioningError, UserPool, fast_login, lease_user
+from .stand_in import StandInServer
 from .utils import (
     generate_username,
+    login,
     make_driver,
+    open_home,
     register_user_via_ui,
 )
 
 
+POOL_KEY = pytest.StashKey[DriverPool]()
+RUN_START_KEY = pytest.StashKey[float]()
+STAND_IN_KEY = pytest.StashKey[StandInServer]()
+_timings = WorkerTimings()
+_cache_totals = {"hits": 0, "misses": 0, "invalidations": 0}
+_network = network.NetworkCounter()
+PROFILED_DRIVER_KEY = pytest.StashKey[object]()
+BODY_PROFILE_KEY = pytest.StashKey[profiler.Profile]()
+_command_totals = profiler.Profile()
+REPORTS_KEY = pytest.StashKey[dict]()
+PLAN_KEY = pytest.StashKey[scheduling.Plan]()
+
+
+def _start_stand_in(config):
+    """DEMOBLAZE_LOCAL=1: serve the site from a local stand-in (one per process)."""
+    server = StandInServer(
+        page_latency_ms=float(os.getenv("STAND_IN_PAGE_LATENCY_MS", "0")),
+        api_latency_ms=float(os.getenv("STAND_IN_API_LATENCY_MS", "0")),
+        jitter_ms=float(os.getenv("STAND_IN_JITTER_MS", "0")),
+    ).start()
+    utils.use_site(server.url, server.api_url)
+    config.stash[STAND_IN_KEY] = server
+
+
+def pytest_configure(config):
+    config.stash[RUN_START_KEY] = time.time()
+    if traces.enabled():
+        traces.start_run()
+    if is_controller(config):
+        clear_worker_files()
+    elif os.getenv("DEMOBLAZE_LOCAL") == "1":
+        _start_stand_in(config)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    """After -m/-k filtering: recent failures first, longest first, optional time budget."""
+    config.stash[PLAN_KEY] = scheduling.plan_collection(config, items)
+
+
+def pytest_unconfigure(config):
+    server = config.stash.get(STAND_IN_KEY, None)
+    if server is not None:
+        server.stop()
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    """Warm browsers shared by the per-test `driver` fixture."""
+    pool = DriverPool(factory=lambda: make_driver(network_log=True))  # drained per test by network_policy
+    request.config.stash[POOL_KEY] = pool
+    yield pool
+    pool.close()
+
+
 @pytest.fixture(scope="function")
-def driver():
-    """Fresh browser per test to avoid cross-test leakage."""
-    drv = make_driver()
+def driver(driver_pool):
+    """Warm pooled browser per test; wiped on release to avoid cross-test leakage."""
+    drv = driver_pool.acquire()
     yield drv
-    drv.quit()
+    driver_pool.release(drv)
 
 
 @pytest.fixture(scope="session")
@@ -33,14 +108,264 @@ def fresh_user():
     """
     Provide credentials valid for this test session.
     - If TEST_USERNAME/TEST_PASSWORD are set, reuse them.
-    - Otherwise register a unique user once per session.
+    - Otherwise lease a user from the on-disk pool (created over HTTP if the
+      pool is empty) and give it back at the end of the session.
+    - USER_PROVISIONING=ui, or an unreachable API, falls back to registering
+      through a real browser.
+    Under xdist every worker has its own session, so each worker gets its own
+    user (and cart) - do not set TEST_USERNAME for parallel runs.
     """
     env_user = os.getenv("TEST_USERNAME")
     env_pass = os.getenv("TEST_PASSWORD")
     if env_user and env_pass:
-        return {"username": env_user, "password": env_pass, "alert_text": "using env credentials"}
+        yield {"username": env_user, "password": env_pass, "alert_text": "using env credentials"}
+        return
+
+    if os.getenv("USER_PROVISIONING", "http").lower() != "ui":
+        pool = UserPool()
+        try:
+            user = lease_user(f"{worker_id()}:{os.getpid()}", pool)
+        except ProvisioningError:
+            user = None
+        if user:
+            yield user
+            pool.release(user["username"])
+            try:
+                pool.replenish()
+            except ProvisioningError:
+                pass
+            return
 
     username = generate_username()
     password = "Password123!"
     alert_text = register_user_via_ui(username, password)
-    return {"username": username, "password": password, "alert_text": alert_text}
+    yield {"username": username, "password": password, "alert_text": alert_text}
+
+
+@pytest.fixture(scope="session")
+def catalog():
+    """Product index (id, title, price, category, url) built once from the API."""
+    try:
+        return get_catalog()
+    except ProvisioningError as exc:
+        pytest.skip(f"catalog API unreachable: {exc}")
+
+
+@pytest.fixture(autouse=True)
+def locator_cache_stats(request):
+    """Per-test locator-cache counters (hits = chromedriver lookups avoided)."""
+    CacheStats.reset()
+    yield
+    stats = CacheStats.snapshot()
+    request.node.user_properties.append(("locator_cache", stats))
+    for key, value in stats.items():
+        _cache_totals[key] += value
+
+
+def _network_categories(request):
+    if request.node.get_closest_marker("network_allow_all"):
+        return []
+    marker = request.node.get_closest_marker("network_block")
+    if marker:
+        return list(marker.args)
+    return network.default_categories()
+
+
+@pytest.fixture(autouse=True)
+def network_policy(request):
+    """Apply the test's request-blocking policy to `driver` and count blocked traffic."""
+    if "driver" not in request.fixturenames:
+        yield
+        return
+    drv = request.getfixturevalue("driver")
+    categories = _network_categories(request)
+    network.apply_policy(drv, categories)
+    network.drain_log(drv)
+    yield
+    stats = _network.count(network.drain_log(drv))
+    request.node.user_properties.append(("network", dict(stats, blocked_categories=categories)))
+
+
+def _alert_mode(request) -> str:
+    if request.node.get_closest_marker("native_alerts"):
+        return "native"
+    if request.node.get_closest_marker("capture_alerts"):
+        return "capture"
+    return alerts.default_mode()
+
+
+@pytest.fixture(autouse=True)
+def alert_capture(request):
+    """ALERT_MODE=capture / @pytest.mark.capture_alerts: hook window.alert in the test's browser."""
+    name = next((n for n in ("driver", "session_driver") if n in request.fixturenames), None)
+    if name is None or _alert_mode(request) != "capture":
+        yield
+        return
+    drv = request.getfixturevalue(name)
+    alerts.install(drv)
+    yield
+    alerts.uninstall(drv)  # pooled browsers go back to native dialogs
+
+
+@pytest.fixture(autouse=True)
+def action_timing(request):
+    """ACTION_TIMING=1: tag action records with the test and attach its timeline to Allure."""
+    if not instrumentation.ENABLED:
+        yield
+        return
+    instrumentation.RECORDER.current_test = request.node.nodeid
+    yield
+    allure.attach(
+        instrumentation.action_table_csv(request.node.nodeid),
+        name="action timings",
+        attachment_type=allure.attachment_type.CSV,
+    )
+    instrumentation.RECORDER.current_test = None
+
+
+@pytest.fixture(autouse=True)
+def command_profile(request):
+    """Profile WebDriver commands of the test's browser (see pytest_runtest_call)."""
+    name = next((n for n in ("driver", "session_driver") if n in request.fixturenames), None)
+    if name is None:
+        yield
+        return
+    drv = request.getfixturevalue(name)
+    profiler.attach(drv)
+    request.node.stash[PROFILED_DRIVER_KEY] = drv
+    yield
+    body = request.node.stash.get(BODY_PROFILE_KEY, None)
+    if body is not None:
+        request.node.user_properties.append(("webdriver_commands", body.as_dict()))
+        for command, (count, secs) in body.by_command.items():
+            entry = _command_totals.by_command.setdefault(command, [0, 0.0])
+            entry[0] += count
+            entry[1] += secs
+        _command_totals.total += body.total
+        _command_totals.seconds += body.seconds
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Count (and trace) the test body's commands and enforce @pytest.mark.command_budget(n)."""
+    drv = item.stash.get(PROFILED_DRIVER_KEY, None)
+    if drv is None:
+        return (yield)
+    body = profiler.attach(drv, trace=traces.enabled())
+    item.stash[BODY_PROFILE_KEY] = body
+    outcome = "failed"
+    try:
+        result = yield
+        outcome = "passed"
+    finally:
+        traces.write(item.nodeid, body, outcome)
+    marker = item.get_closest_marker("command_budget")
+    if marker and body.total > marker.args[0]:
+        pytest.fail(
+            f"WebDriver command budget exceeded: {body.total} > {marker.args[0]} "
+            f"(top helpers: {body.top()})",
+            pytrace=False,
+        )
+    return result
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+    report = yield
+    item.stash.setdefault(REPORTS_KEY, {})[report.when] = report
+    return report
+
+
+@pytest.fixture(autouse=True)
+def artifact_capture(request):
+    """Route take_screenshot() output to this test; attach or drop it at teardown."""
+    pipeline = artifacts.PIPELINE
+    pipeline.current_test = request.node.nodeid
+    yield
+    reports = request.node.stash.get(REPORTS_KEY, {})
+    failed = any(r.failed for r in reports.values())
+    drv = request.node.stash.get(PROFILED_DRIVER_KEY, None)
+    if failed and pipeline.mode == "on_failure" and drv is not None:
+        pipeline.capture(drv, f"failure_{request.node.name}")
+    pipeline.finish_test(request.node.nodeid, failed)
+    pipeline.current_test = None
+
+
+def _login_mode(request) -> str:
+    if request.node.get_closest_marker("ui_login"):
+        return "ui"
+    if request.node.get_closest_marker("fast_login"):
+        return "fast"
+    return os.getenv("LOGIN_MODE", "fast").lower()
+
+
+@pytest.fixture(scope="function")
+def logged_in_user(fresh_user, driver, request):
+    """
+    `driver` signed in as `fresh_user`, parked on the home page.
+    - fast (default): auth token fetched once per user and injected as a cookie.
+    - ui: the real login modal. Pick with @pytest.mark.ui_login /
+      @pytest.mark.fast_login, or LOGIN_MODE=ui|fast for the whole run.
+    """
+    if _login_mode(request) == "ui":
+        open_home(driver)
+        login(driver, fresh_user["username"], fresh_user["password"])
+    else:
+        fast_login(driver, fresh_user["username"], fresh_user["password"])
+    return fresh_user
+
+
+def pytest_runtest_logreport(report):
+    # On the xdist controller these are worker reports; the workers record their own.
+    if not os.getenv("PYTEST_XDIST_WORKER") and getattr(report, "node", None) is not None:
+        return
+    _timings.add(report.nodeid, report.duration, report.outcome)
+
+
+def pytest_sessionfinish(session):
+    artifacts.PIPELINE.close()
+    config = session.config
+    if config.option.collectonly or is_controller(config) or not _timings.tests:
+        return  # nothing ran here: leave history, timings and exports as they are
+    if is_worker(config):
+        _timings.dump()  # merged by the controller
+    scheduling.DurationStore().record(_timings.tests)
+    timeouts.SERVICE.save()
+    instrumentation.export()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    plan = config.stash.get(PLAN_KEY, None)
+    if plan is not None and plan.ordered:
+        terminalreporter.write_line(plan.summary())
+    pool = config.stash.get(POOL_KEY, None)
+    if pool is not None and pool.launches:
+        terminalreporter.write_line(pool.summary())
+    if driver_profiles.STARTUP.by_profile:
+        terminalreporter.write_line(driver_profiles.STARTUP.summary())
+    if _cache_totals["hits"] or _cache_totals["misses"]:
+        terminalreporter.write_line(
+            "locator cache: {hits} hits (lookups avoided), {misses} misses, "
+            "{invalidations} invalidations".format(**_cache_totals)
+        )
+    if _command_totals.total:
+        terminalreporter.write_line(
+            f"webdriver: {_command_totals.total} commands in test bodies, "
+            f"{_command_totals.seconds:.1f}s round-trip time"
+        )
+    if _network.totals["requests"]:
+        terminalreporter.write_line(_network.summary())
+    if waits.STATS.count:
+        terminalreporter.write_line(waits.STATS.summary())
+        terminalreporter.write_line(timeouts.SERVICE.summary())
+    if is_controller(config):
+        report = merge_worker_files(time.time() - config.stash[RUN_START_KEY])
+        terminalreporter.write_sep("-", "parallel workers")
+        for w in report["workers"]:
+            terminalreporter.write_line(
+                f"{w['worker']}: {w['tests']} tests, busy {w['busy_seconds']}s, wall {w['wall_seconds']}s"
+            )
+        terminalreporter.write_line(
+            f"wall {report['wall_seconds']}s vs serial ~{report['serial_estimate_seconds']}s "
+            f"(speedup x{report['speedup']}, efficiency {report['efficiency']:.0%})"
+        )
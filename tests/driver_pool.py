@@ -0,0 +1,152 @@
+"""
+Warm Chrome pool behind the function-scoped ``driver`` fixture.
+
+Launching Chrome is the slowest part of most tests, so the pool keeps a few
+sessions alive and wipes them between tests instead of quitting them:
+extra tabs are closed, cookies and origin storage are cleared and the
+remaining tab is a brand-new ``about:blank`` one (fresh sessionStorage).
+
+Knobs (environment variables):
+- DRIVER_POOL_SIZE      max warm sessions kept alive (0 = old quit-per-test behaviour)
+- DRIVER_POOL_MAX_USES  recycle a session after this many tests
+"""
+
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import NoAlertPresentException, WebDriverException
+
+from . import alerts, network, utils
+
+
+DEFAULT_POOL_SIZE = 1
+DEFAULT_MAX_USES = 20
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value and value.strip().isdigit() else default
+
+
+def _origin(url: str) -> str:
+    parts = urlparse(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def reset_session(driver):
+    """
+    Bring a used browser back to a clean, logged-out, blank state. The fresh
+    tab gets the per-tab hooks of the old one again (request block list,
+    alert capture).
+    """
+    try:
+        driver.switch_to.alert.dismiss()
+    except NoAlertPresentException:
+        pass
+    old_handles = driver.window_handles
+    driver.switch_to.new_window("tab")
+    fresh = driver.current_window_handle
+    for handle in old_handles:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(fresh)
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    driver.execute_cdp_cmd(
+        "Storage.clearDataForOrigin",
+        {"origin": _origin(utils.BASE_URL), "storageTypes": "all"},
+    )
+    driver.get("about:blank")
+    network.reapply_policy(driver)
+    alerts.reinstall(driver)
+
+
+class DriverPool:
+    """Hands out warm drivers; thread-safe so parallel callers share one pool."""
+
+    def __init__(self, factory=None, size=None, max_uses=None):
+        self.factory = factory or utils.make_driver
+        self.size = _env_int("DRIVER_POOL_SIZE", DEFAULT_POOL_SIZE) if size is None else size
+        self.max_uses = _env_int("DRIVER_POOL_MAX_USES", DEFAULT_MAX_USES) if max_uses is None else max_uses
+        self._idle = []
+        self._uses = {}
+        self._lock = threading.Lock()
+        # stats
+        self.launches = 0
+        self.reuses = 0
+        self.recycled = 0
+        self.startup_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def _launch(self):
+        started = time.perf_counter()
+        driver = self.factory()
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.launches += 1
+            self.startup_seconds += elapsed
+            self._uses[driver] = 0
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            self._uses.pop(driver, None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    def acquire(self):
+        """Return an idle warm driver, or launch a new one."""
+        with self._lock:
+            driver = self._idle.pop() if self._idle else None
+            if driver is not None:
+                self.reuses += 1
+        if driver is None:
+            driver = self._launch()
+        with self._lock:
+            self._uses[driver] += 1
+        return driver
+
+    def release(self, driver):
+        """Reset and park the driver, or quit it if worn out, crashed or surplus."""
+        with self._lock:
+            uses = self._uses.get(driver, 0)
+            keep = self.enabled and uses < self.max_uses and len(self._idle) < self.size
+        if keep:
+            try:
+                reset_session(driver)
+            except WebDriverException:
+                keep = False
+        if not keep:
+            if self.enabled:
+                with self._lock:
+                    self.recycled += 1
+            self._discard(driver)
+            return
+        with self._lock:
+            self._idle.append(driver)
+
+    def close(self):
+        """Quit every driver still owned by the pool."""
+        with self._lock:
+            drivers = list(self._uses)
+            self._idle.clear()
+        for driver in drivers:
+            self._discard(driver)
+
+    def saved_seconds(self) -> float:
+        """Estimated startup time avoided by reusing sessions."""
+        if not self.launches:
+            return 0.0
+        return self.reuses * (self.startup_seconds / self.launches)
+
+    def summary(self) -> str:
+        return (
+            f"driver pool: {self.launches} launches, {self.reuses} reuses, "
+            f"{self.recycled} recycled, ~{self.saved_seconds():.1f}s startup saved"
+        )
@@ -0,0 +1,177 @@
+"""
+Named Chrome launch profiles and a cached chromedriver lookup.
+
+A profile bundles the options `make_driver` launches Chrome with: headless
+or headed, window size, extra switches, and where its throwaway user-data
+dirs live (tmpfs when available). Pick one with DRIVER_PROFILE or
+`make_driver(profile=...)`:
+
+- default       headed + maximized, Chrome's own defaults (historic behaviour)
+- ci-fast       headless, fixed window, no extensions/GPU/background throttling,
+                profile dir on /dev/shm
+- debug-headed  headed + maximized, no extensions, keeps background tabs running
+- low-memory    headless, small window, capped renderer processes and JS heap
+
+The user-data dir itself comes from tests/profile_templates.py.
+
+`driver_path()` resolves chromedriver once per process; the answer is also
+kept in `.driver_path.json` (flock-protected) so xdist workers and later runs
+skip webdriver-manager's version check. DRIVER_PATH_CACHE_HOURS (default 24)
+controls how long that file is trusted.
+"""
+
+import fcntl
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from selenium import webdriver
+from webdriver_manager.chrome import ChromeDriverManager
+
+
+ROOT = Path(__file__).resolve().parent.parent
+CACHE_FILE = ROOT / ".driver_path.json"
+SHM_DIR = Path("/dev/shm")
+
+_QUIET = [
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-extensions",
+    "--disable-component-update",
+    "--disable-sync",
+]
+_NO_THROTTLING = [
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+]
+
+PROFILES = {
+    "default": {"headless": False, "window": None, "args": [], "tmpfs": False},
+    "ci-fast": {
+        "headless": True,
+        "window": (1366, 900),
+        "args": _QUIET + _NO_THROTTLING + ["--disable-gpu", "--mute-audio"],
+        "tmpfs": True,
+    },
+    "debug-headed": {"headless": False, "window": None, "args": _QUIET + _NO_THROTTLING, "tmpfs": False},
+    "low-memory": {
+        "headless": True,
+        "window": (1024, 768),
+        "args": _QUIET + [
+            "--disable-gpu",
+            "--renderer-process-limit=2",
+            "--js-flags=--max-old-space-size=256",
+            "--disable-features=Translate,MediaRouter,OptimizationHints",
+        ],
+        "tmpfs": False,  # keep the profile off RAM-backed storage
+    },
+}
+
+
+def profile_name(name: str = None) -> str:
+    name = (name or os.getenv("DRIVER_PROFILE") or "default").lower()
+    if name not in PROFILES:
+        raise ValueError(f"unknown DRIVER_PROFILE {name!r}; pick one of {', '.join(PROFILES)}")
+    return name
+
+
+def user_data_root(name: str) -> Path:
+    """Where a profile's throwaway user-data dirs are created."""
+    if PROFILES[name]["tmpfs"] and SHM_DIR.is_dir() and os.access(SHM_DIR, os.W_OK):
+        return SHM_DIR
+    return Path(tempfile.gettempdir())
+
+
+def build_options(name: str, data_dir: Path = None):
+    """ChromeOptions for profile `name`, launching from `data_dir` when given."""
+    spec = PROFILES[name]
+    options = webdriver.ChromeOptions()
+    if spec["headless"]:
+        options.add_argument("--headless=new")
+    if spec["window"]:
+        options.add_argument("--window-size={},{}".format(*spec["window"]))
+    for arg in spec["args"]:
+        options.add_argument(arg)
+    if data_dir is not None:
+        options.add_argument(f"--user-data-dir={data_dir}")
+    return options
+
+
+def remove_on_quit(driver, path: Path):
+    """Delete `path` once the browser has exited."""
+    quit_browser = driver.quit
+
+    def quit():
+        try:
+            quit_browser()
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
+    driver.quit = quit
+
+
+# ----------------------
+# chromedriver resolution
+# ----------------------
+_resolved = None
+_resolve_lock = threading.Lock()
+
+
+def _cache_is_fresh(entry) -> bool:
+    max_age = float(os.getenv("DRIVER_PATH_CACHE_HOURS", "24")) * 3600
+    return bool(entry) and Path(entry["path"]).exists() and time.time() - entry["resolved"] < max_age
+
+
+def _resolve_via_file(cache_file: Path = CACHE_FILE) -> str:
+    with open(cache_file.with_suffix(".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            entry = json.loads(cache_file.read_text()) if cache_file.exists() else None
+        except ValueError:
+            entry = None
+        if not _cache_is_fresh(entry):
+            entry = {"path": ChromeDriverManager().install(), "resolved": time.time()}
+            cache_file.write_text(json.dumps(entry, indent=2))
+        fcntl.flock(lock, fcntl.LOCK_UN)
+    return entry["path"]
+
+
+def driver_path() -> str:
+    """chromedriver binary: CHROME_DRIVER_PATH, else the cached webdriver-manager result."""
+    global _resolved
+    with _resolve_lock:
+        if _resolved is None:
+            _resolved = os.getenv("CHROME_DRIVER_PATH") or _resolve_via_file()
+        return _resolved
+
+
+# ----------------------
+# startup timing
+# ----------------------
+class StartupStats:
+    """Browser launch times per profile (this process)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.by_profile = {}  # name -> [seconds, ...]
+
+    def add(self, name: str, seconds: float):
+        with self._lock:
+            self.by_profile.setdefault(name, []).append(seconds)
+
+    def summary(self) -> str:
+        parts = []
+        for name, samples in sorted(self.by_profile.items()):
+            ordered = sorted(samples)
+            parts.append(
+                f"{name} x{len(samples)} median {ordered[len(ordered) // 2]:.2f}s max {ordered[-1]:.2f}s"
+            )
+        return "browser startup: " + "; ".join(parts)
+
+
+STARTUP = StartupStats()
@@ -0,0 +1,161 @@
+"""
+Per-action latency instrumentation for helpers and page objects.
+
+Decorate an action with `@timed` (or `@timed("name")`) to record its wall
+time and the number of WebDriver commands it issued. Enabled with
+ACTION_TIMING=1; when off, `timed` returns the function untouched, so the
+cost is zero.
+
+Results roll up into per-action and per-test percentiles, are written to
+`reports/action_timings*.json` and attached to Allure as a CSV table per test.
+"""
+
+import functools
+import json
+import os
+import time
+from pathlib import Path
+
+
+REPORT_DIR = Path(__file__).resolve().parent.parent / "reports"
+ENABLED = os.getenv("ACTION_TIMING") == "1"
+
+
+class Recorder:
+    """Collects action records for the whole process."""
+
+    def __init__(self):
+        self.current_test = None
+        self.depth = 0
+        self.records = []
+
+    def add(self, action, seconds, commands, depth):
+        self.records.append({
+            "test": self.current_test,
+            "action": action,
+            "seconds": seconds,
+            "commands": commands,
+            "depth": depth,
+        })
+
+    def for_test(self, nodeid):
+        return [r for r in self.records if r["test"] == nodeid]
+
+
+RECORDER = Recorder()
+
+
+# ----------------------
+# Command counting
+# ----------------------
+def command_counter(driver):
+    """Wrap driver.execute once so every WebDriver command bumps a counter."""
+    counter = getattr(driver, "_command_counter", None)
+    if counter is None:
+        counter = [0]
+        original = driver.execute
+
+        def execute(driver_command, params=None):
+            counter[0] += 1
+            return original(driver_command, params)
+
+        driver.execute = execute
+        driver._command_counter = counter
+    return counter
+
+
+def _driver_from(args):
+    if not args:
+        return None
+    first = args[0]
+    if hasattr(first, "session_id"):
+        return first
+    return getattr(first, "driver", None)
+
+
+# ----------------------
+# Decorator
+# ----------------------
+def timed(name=None):
+    """Record wall time and WebDriver command count of each call."""
+
+    def decorate(func):
+        if not ENABLED:
+            return func
+        action = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            driver = _driver_from(args)
+            counter = command_counter(driver) if driver is not None else None
+            before = counter[0] if counter else 0
+            depth = RECORDER.depth
+            RECORDER.depth += 1
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                RECORDER.depth -= 1
+                RECORDER.add(action, time.perf_counter() - started, (counter[0] - before) if counter else 0, depth)
+
+        return wrapper
+
+    if callable(name):  # used as bare @timed
+        func, name = name, None
+        return decorate(func)
+    return decorate
+
+
+# ----------------------
+# Roll-ups / export
+# ----------------------
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def rollup(records, key):
+    groups = {}
+    for r in records:
+        groups.setdefault(r[key], []).append(r)
+    out = {}
+    for group, items in groups.items():
+        secs = [r["seconds"] for r in items]
+        out[group] = {
+            "calls": len(items),
+            "total_s": round(sum(secs), 3),
+            "p50_s": round(percentile(secs, 50), 3),
+            "p90_s": round(percentile(secs, 90), 3),
+            "p99_s": round(percentile(secs, 99), 3),
+            "max_s": round(max(secs), 3),
+            "commands": sum(r["commands"] for r in items),
+        }
+    return out
+
+
+def action_table_csv(nodeid) -> str:
+    """CSV timeline of one test's actions (indent shows nesting)."""
+    lines = ["action,seconds,commands"]
+    for r in RECORDER.for_test(nodeid):
+        lines.append(f"{'  ' * r['depth']}{r['action']},{r['seconds']:.3f},{r['commands']}")
+    return "\n".join(lines)
+
+
+def export(directory=REPORT_DIR):
+    """Write raw records plus per-action and per-test (top-level only) roll-ups."""
+    if not RECORDER.records:
+        return None
+    directory.mkdir(parents=True, exist_ok=True)
+    worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+    path = directory / ("action_timings.json" if worker == "main" else f"action_timings_{worker}.json")
+    top_level = [r for r in RECORDER.records if r["depth"] == 0]
+    payload = {
+        "per_action": rollup(RECORDER.records, "action"),
+        "per_test": rollup(top_level, "test"),
+        "records": RECORDER.records,
+    }
+    path.write_text(json.dumps(payload, indent=2))
+    return path
@@ -0,0 +1,64 @@
+"""
+Locators shared by utils.py and the page objects (one definition each).
+"""
+
+from selenium.webdriver.common.by import By
+
+
+# Header
+LOGIN_LINK = (By.ID, "login2")
+SIGNUP_LINK = (By.ID, "signin2")
+LOGOUT_LINK = (By.ID, "logout2")
+CART_LINK = (By.ID, "cartur")
+WELCOME = (By.ID, "nameofuser")
+CONTACT_LINK = (By.LINK_TEXT, "Contact")
+ABOUT_LINK = (By.LINK_TEXT, "About us")
+
+# Modals
+SIGNUP_USERNAME = (By.ID, "sign-username")
+SIGNUP_PASSWORD = (By.ID, "sign-password")
+SIGNUP_SUBMIT = (By.XPATH, "//div[@id='signInModal']//button[text()='Sign up']")
+LOGIN_USERNAME = (By.ID, "loginusername")
+LOGIN_PASSWORD = (By.ID, "loginpassword")
+LOGIN_SUBMIT = (By.XPATH, "//div[@id='logInModal']//button[text()='Log in']")
+CONTACT_MODAL = (By.ID, "exampleModal")
+CONTACT_EMAIL = (By.ID, "recipient-email")
+CONTACT_NAME = (By.ID, "recipient-name")
+CONTACT_MESSAGE = (By.ID, "message-text")
+CONTACT_SUBMIT = (By.XPATH, "//div[@id='exampleModal']//button[text()='Send message']")
+ABOUT_MODAL = (By.ID, "videoModal")
+ABOUT_CLOSE = (By.CSS_SELECTOR, "#videoModal .close")
+OPEN_MODAL = (By.CSS_SELECTOR, ".modal.show")
+OPEN_MODAL_CLOSE = (By.CSS_SELECTOR, ".modal.show button.close")
+
+# Catalog
+CARD_CSS = "#tbodyid .card"
+CARD_TITLE_CSS = "#tbodyid .card-title"
+CARDS = (By.CSS_SELECTOR, CARD_CSS)
+CARD_TITLE = (By.CSS_SELECTOR, CARD_TITLE_CSS)
+CARD_LINK = (By.CSS_SELECTOR, "a[href*='prod.html']")
+FIRST_CARD_LINK = (By.CSS_SELECTOR, "#tbodyid .card a[href*='prod.html']")
+PRODUCT_LIST = (By.CSS_SELECTOR, "#tbodyid")
+NEXT_PAGE = (By.ID, "next2")
+PREV_PAGE = (By.ID, "prev2")
+ADD_TO_CART = (By.XPATH, "//a[text()='Add to cart']")
+
+# Product page
+PRODUCT_NAME_CSS = ".name"
+PRODUCT_PRICE_CSS = ".price-container"
+PRODUCT_NAME = (By.CSS_SELECTOR, PRODUCT_NAME_CSS)
+
+# Cart / checkout
+CART_ROW_CSS = "#tbodyid tr"
+CART_ROWS = (By.CSS_SELECTOR, CART_ROW_CSS)
+CART_TOTAL_CSS = "#totalp"
+DELETE_LINK = (By.LINK_TEXT, "Delete")
+PLACE_ORDER = (By.XPATH, "//button[text()='Place Order']")
+ORDER_NAME = (By.ID, "name")
+ORDER_COUNTRY = (By.ID, "country")
+ORDER_CITY = (By.ID, "city")
+ORDER_CARD = (By.ID, "card")
+ORDER_MONTH = (By.ID, "month")
+ORDER_YEAR = (By.ID, "year")
+PURCHASE = (By.XPATH, "//button[text()='Purchase']")
+SUCCESS_MODAL = (By.CSS_SELECTOR, "div.sweet-alert.showSweetAlert.visible")
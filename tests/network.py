@@ -0,0 +1,96 @@
+"""
+Network policy for test browsers: block request categories we never assert
+on (images, media, fonts, third-party scripts) through the DevTools
+protocol, and count how many requests were blocked. Blocked bytes are not
+known (a blocked URL never loads), so no savings in bytes are reported.
+
+Default categories come from NETWORK_BLOCK (comma list, "none" to disable);
+tests override with @pytest.mark.network_block("images", ...) or opt out
+with @pytest.mark.network_allow_all.
+"""
+
+import json
+import os
+
+from selenium.common.exceptions import WebDriverException
+
+
+CATEGORIES = {
+    "images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico"],
+    "media": ["*.mp4", "*.webm", "*.ogg", "*.m3u8", "*.ts", "*.mp3"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*fonts.googleapis.com*", "*fonts.gstatic.com*"],
+    "third_party": [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*googlesyndication.com*",
+        "*facebook.net*",
+        "*hotjar.com*",
+    ],
+}
+DEFAULT_BLOCK = "media,third_party"
+
+
+def default_categories():
+    raw = os.getenv("NETWORK_BLOCK", DEFAULT_BLOCK).strip().lower()
+    if raw in ("", "none", "off"):
+        return []
+    return [c.strip() for c in raw.split(",") if c.strip()]
+
+
+def patterns_for(categories):
+    unknown = [c for c in categories if c not in CATEGORIES]
+    if unknown:
+        raise ValueError(f"unknown network categories {unknown}; pick from {sorted(CATEGORIES)}")
+    return [pattern for c in categories for pattern in CATEGORIES[c]]
+
+
+def apply_policy(driver, categories):
+    """Block the given categories (an empty list unblocks everything)."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns_for(categories)})
+    driver._blocked_categories = list(categories)  # the block list is per tab; see reapply_policy
+
+
+def reapply_policy(driver):
+    """Restore the last policy after switching to a new tab (no-op if none was applied)."""
+    categories = getattr(driver, "_blocked_categories", None)
+    if categories is not None:
+        apply_policy(driver, categories)
+
+
+def drain_log(driver):
+    """Read (and thereby clear) the browser's performance log."""
+    try:
+        return driver.get_log("performance")
+    except WebDriverException:
+        return []
+
+
+class NetworkCounter:
+    """Turns performance-log entries into request counts and bytes loaded."""
+
+    def __init__(self):
+        self.totals = {"requests": 0, "blocked_requests": 0, "bytes_loaded": 0}
+
+    def count(self, entries) -> dict:
+        stats = {"requests": 0, "blocked_requests": 0, "bytes_loaded": 0}
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method, params = message.get("method"), message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                stats["requests"] += 1
+            elif method == "Network.loadingFinished":
+                stats["bytes_loaded"] += int(params.get("encodedDataLength", 0))
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                stats["blocked_requests"] += 1
+        for key, value in stats.items():
+            self.totals[key] += value
+        return stats
+
+    def summary(self) -> str:
+        t = self.totals
+        return (
+            f"network: {t['requests']} requests ({t['blocked_requests']} blocked, count only), "
+            f"{t['bytes_loaded'] / 1024:.0f} KiB loaded"
+        )
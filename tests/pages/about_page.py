@@ -1,5 +1,4 @@
-from selenium.webdriver.common.by import By
-
+from tests import locators as L
 from tests.utils import open_about_modal, wait_click
 
 
@@ -9,4 +8,4 @@ class AboutPage:
 
     def open_and_close(self):
         open_about_modal(self.driver)
-        wait_click(self.driver, (By.CSS_SELECTOR, "#videoModal .close"))
+        wait_click(self.driver, L.ABOUT_CLOSE)
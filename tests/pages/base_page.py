@@ -1,29 +1,130 @@
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    StaleElementReferenceException,
+)
+
+from tests.backends import SeleniumBackend
+from tests.instrumentation import timed
+
+
+class CacheStats:
+    """Locator-cache counters shared by every page object (reset per test by conftest)."""
+
+    hits = 0
+    misses = 0
+    invalidations = 0
+
+    @classmethod
+    def snapshot(cls):
+        return {"hits": cls.hits, "misses": cls.misses, "invalidations": cls.invalidations}
+
+    @classmethod
+    def reset(cls):
+        cls.hits = cls.misses = cls.invalidations = 0
 
 
 class BasePage:
     """Base page with simple, readable helpers for juniors."""
 
-    def __init__(self, driver):
+    def __init__(self, driver, backend=None):
         self.driver = driver
+        self.backend = backend or SeleniumBackend(driver)  # see tests/backends
+        self._elements = {}
+
+    # Locator cache: remembers elements already resolved on this page.
+    # Navigation helpers call invalidate(); a stale element also clears it.
+    def invalidate(self):
+        if self._elements:
+            CacheStats.invalidations += 1
+        self._elements.clear()
+
+    def _with_element(self, locator, resolve, action):
+        cached = self._elements.get(locator)
+        if cached is not None:
+            try:
+                result = action(cached)
+                CacheStats.hits += 1
+                return result
+            except StaleElementReferenceException:
+                self.invalidate()
+            except (ElementNotInteractableException, ElementClickInterceptedException):
+                self._elements.pop(locator, None)  # not ready yet: wait for it properly
+        CacheStats.misses += 1
+        element = resolve()
+        self._elements[locator] = element
+        return action(element)
+
+    def find(self, locator):
+        return self._with_element(locator, lambda: self.driver.find_element(*locator), lambda el: el)
+
+    @timed
+    def click(self, locator, timeout=None):
+        self._with_element(locator, lambda: self.backend.clickable(locator, timeout), lambda el: el.click())
+
+    @timed
+    def fill(self, locator, text, timeout=None):
+        def type_into(field):
+            field.clear()
+            field.send_keys(text)
+
+        self._with_element(locator, lambda: self.backend.visible(locator, timeout), type_into)
+
+    @timed
+    def fill_form(self, fields, keystrokes=None, timeout=None):
+        """Fill `{locator: value}` in one script call; keystrokes=True types per field (see utils.fill_form)."""
+        if keystrokes:
+            for locator, value in fields.items():
+                self.fill(locator, value, timeout)
+            return
+        self.backend.fill_form(fields, keystrokes, timeout)
+
+    def wait_text_in(self, locator, text, timeout=None):
+        self.backend.wait_text_in(locator, text, timeout)
+
+    def wait_visible(self, locator, timeout=None):
+        return self.backend.visible(locator, timeout)
+
+    def wait_alert_and_accept(self, timeout=None):
+        return self.backend.next_alert(timeout)
+
+    # Batched reads: one script call instead of find + .text per element
+    def extract(self, css, fields, with_elements=False):
+        return self.backend.extract(css, fields, with_elements)
+
+    def read_text(self, css):
+        return self.backend.read_text(css)
+
+
+class AsyncBasePage:
+    """
+    Async twin of BasePage over a CdpSession (tests/backends/cdp.py).
+    No element cache: every action is one in-page wait plus the input event.
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+    async def click(self, locator, timeout=None):
+        await self.session.click(locator, timeout)
+
+    async def fill(self, locator, text, timeout=None):
+        await self.session.fill(locator, text, timeout)
+
+    async def fill_form(self, fields, timeout=None):
+        await self.session.fill_form(fields, timeout)
 
-    def click(self, locator, timeout=10):
-        WebDriverWait(self.driver, timeout).until(EC.element_to_be_clickable(locator)).click()
+    async def wait_text_in(self, locator, text, timeout=None):
+        await self.session.wait_text_in(locator, text, timeout)
 
-    def fill(self, locator, text, timeout=10):
-        field = WebDriverWait(self.driver, timeout).until(EC.visibility_of_element_located(locator))
-        field.clear()
-        field.send_keys(text)
+    async def wait_visible(self, locator, timeout=None):
+        return await self.session.wait_visible(locator, timeout)
 
-    def wait_text_in(self, locator, text, timeout=10):
-        WebDriverWait(self.driver, timeout).until(EC.text_to_be_present_in_element(locator, text))
+    async def wait_alert_and_accept(self, timeout=None):
+        return await self.session.next_alert(timeout)
 
-    def wait_visible(self, locator, timeout=10):
-        return WebDriverWait(self.driver, timeout).until(EC.visibility_of_element_located(locator))
+    async def extract(self, css, fields):
+        return await self.session.extract(css, fields)
 
-    def wait_alert_and_accept(self, timeout=10):
-        alert = WebDriverWait(self.driver, timeout).until(EC.alert_is_present())
-        txt = alert.text
-        alert.accept()
-        return txt
+    async def read_text(self, css):
+        return await self.session.read_text(css)
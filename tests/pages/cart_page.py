@@ -1,31 +1,84 @@
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-
-from tests.pages.base_page import BasePage
-from tests.utils import cart_rows, place_order, wait_for_success_modal
+from tests import locators as L
+from tests import waits
+from tests.instrumentation import timed
+from tests.pages.base_page import AsyncBasePage, BasePage
+from tests.utils import cart_rows, place_order, read_text, to_price, wait_for_success_modal
 
 
 class CartPage(BasePage):
     """Cart interactions."""
 
-    def __init__(self, driver):
-        self.driver = driver
-
+    @timed
     def rows(self):
         return cart_rows(self.driver)
 
+    @timed
     def total(self):
-        txt = WebDriverWait(self.driver, 5).until(
-            lambda drv: drv.find_element(By.ID, "totalp").text
-        )
-        return int(txt) if txt.isdigit() else 0
+        txt = waits.until(self.driver, lambda drv: read_text(drv, L.CART_TOTAL_CSS), message="cart total empty")
+        return to_price(txt)
 
+    @timed
     def delete_first_row(self):
-        initial = len(self.driver.find_elements(By.CSS_SELECTOR, "#tbodyid tr"))
-        WebDriverWait(self.driver, 5).until(EC.element_to_be_clickable((By.LINK_TEXT, "Delete"))).click()
-        WebDriverWait(self.driver, 5).until(lambda drv: len(drv.find_elements(By.CSS_SELECTOR, "#tbodyid tr")) < initial)
+        initial = len(self.driver.find_elements(*L.CART_ROWS))
+        self.click(L.DELETE_LINK)
+        waits.until_js(
+            self.driver,
+            "return document.querySelectorAll(args[1]).length < args[0];",
+            [initial, L.CART_ROW_CSS],
+            message="cart row was not removed",
+        )
+        self.invalidate()  # rows are re-rendered
 
+    @timed
     def checkout(self, name, country, city, card, month, year):
         place_order(self.driver, name, country, city, card, month, year)
         return wait_for_success_modal(self.driver)
+
+
+class AsyncCartPage(AsyncBasePage):
+    """CartPage flows as coroutines over a CdpSession."""
+
+    async def rows(self, count: int = 1):
+        """Cart rows as [{title, price}] once at least `count` have rendered."""
+        await self.session.wait_js(
+            "return document.querySelectorAll(args[0]).length >= args[1];",
+            [L.CART_ROW_CSS + " td:nth-child(3)", count],
+            message="cart has no rows",
+            key="cart rows",
+        )
+        rows = await self.extract(L.CART_ROW_CSS, {"title": "td:nth-child(2)", "price": "td:nth-child(3)"})
+        return [{"title": r["title"], "price": to_price(r["price"])} for r in rows if r["price"] is not None]
+
+    async def total(self):
+        txt = await self.session.wait_js(
+            "var el = document.querySelector(args[0]); return el ? el.innerText.trim() : '';",
+            [L.CART_TOTAL_CSS],
+            message="cart total empty",
+        )
+        return to_price(txt)
+
+    async def delete_first_row(self):
+        initial = len(await self.rows())
+        await self.click(L.DELETE_LINK)
+        await self.session.wait_js(
+            "return document.querySelectorAll(args[1]).length < args[0];",
+            [initial, L.CART_ROW_CSS],
+            message="cart row was not removed",
+        )
+
+    async def checkout(self, name, country, city, card, month, year) -> str:
+        """Place the order; returns the success modal's heading."""
+        await self.click(L.PLACE_ORDER)
+        await self.fill_form(
+            {
+                L.ORDER_NAME: name,
+                L.ORDER_COUNTRY: country,
+                L.ORDER_CITY: city,
+                L.ORDER_CARD: card,
+                L.ORDER_MONTH: month,
+                L.ORDER_YEAR: year,
+            }
+        )
+        await self.click(L.PURCHASE)
+        await self.wait_visible(L.SUCCESS_MODAL)
+        return await self.read_text(L.SUCCESS_MODAL[1] + " h2")
@@ -1,84 +1,196 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
-from tests.pages.base_page import BasePage
+from tests import locators as L
+from tests import scripts, utils, waits
+from tests.catalog import get_catalog
+from tests.instrumentation import timed
+from tests.pages.base_page import AsyncBasePage, BasePage
+from tests.provisioning import ProvisioningError
 from tests.utils import (
+    add_product_by_id,
     add_product_by_index,
     open_about_modal,
     open_category,
     open_contact_modal,
     open_home,
+    product_cards,
+    product_url,
     submit_contact_form,
-    wait_click,
+    to_price,
 )
 
 
 class HomePage(BasePage):
     """Landing page and shared header actions."""
 
+    @timed
     def open(self):
+        self.invalidate()
         open_home(self.driver)
         return self
 
     # Auth flows
+    @timed
     def register(self, username: str, password: str) -> str:
-        self.click((By.ID, "signin2"))
-        self.fill((By.ID, "sign-username"), username)
-        self.fill((By.ID, "sign-password"), password)
-        self.click((By.XPATH, "//div[@id='signInModal']//button[text()='Sign up']"))
+        self.click(L.SIGNUP_LINK)
+        self.fill_form({L.SIGNUP_USERNAME: username, L.SIGNUP_PASSWORD: password})
+        self.click(L.SIGNUP_SUBMIT)
         return self.wait_alert_and_accept()
 
+    @timed
     def login(self, username: str, password: str):
-        self.click((By.ID, "login2"))
-        self.fill((By.ID, "loginusername"), username)
-        self.fill((By.ID, "loginpassword"), password)
-        self.click((By.XPATH, "//div[@id='logInModal']//button[text()='Log in']"))
-        self.wait_text_in((By.ID, "nameofuser"), f"Welcome {username}")
+        self.click(L.LOGIN_LINK)
+        self.fill_form({L.LOGIN_USERNAME: username, L.LOGIN_PASSWORD: password})
+        self.click(L.LOGIN_SUBMIT)
+        self.invalidate()  # the site reloads the page after login
+        self.wait_text_in(L.WELCOME, f"Welcome {username}")
         return self
 
+    @timed
     def logout(self):
-        self.click((By.ID, "logout2"))
+        self.click(L.LOGOUT_LINK)
+        self.invalidate()
         return self
 
     # Header modals
+    @timed
     def send_contact(self, email, name, message) -> str:
         open_contact_modal(self.driver)
         return submit_contact_form(self.driver, email, name, message)
 
+    @timed
     def open_and_close_about(self):
         open_about_modal(self.driver)
-        self.click((By.CSS_SELECTOR, "#videoModal .close"))
+        self.click(L.ABOUT_CLOSE)
 
     # Catalog actions
+    @timed
     def browse_category(self, name: str):
-        open_category(self.driver, name)
-        WebDriverWait(self.driver, 5).until(
-            EC.visibility_of_element_located((By.CSS_SELECTOR, "#tbodyid .card"))
-        )
+        open_category(self.driver, name)  # waits for the re-rendered card list
+        self.invalidate()
+        self.wait_visible(L.CARDS)
         return self
 
+    @timed
     def first_card_name(self) -> str:
-        return WebDriverWait(self.driver, 5).until(
-            EC.visibility_of_element_located((By.CSS_SELECTOR, "#tbodyid .card-title"))
-        ).text
+        return waits.until(self.driver, lambda drv: self.read_text(L.CARD_TITLE_CSS), message="no product cards")
+
+    def cards(self, with_elements=False):
+        """All product cards on the current page as [{title, price[, element]}]."""
+        return product_cards(self.driver, with_elements=with_elements)
 
+    @timed
     def next_page_until_changed(self, current_first: str):
-        next_btn = self.driver.find_element(By.ID, "next2")
+        next_btn = self.find(L.NEXT_PAGE)
         self.driver.execute_script("arguments[0].scrollIntoView(true);", next_btn)
         next_btn.click()
-        WebDriverWait(self.driver, 8).until(
-            lambda drv: drv.find_element(By.CSS_SELECTOR, "#tbodyid .card-title").text != current_first
+        waits.until_js(
+            self.driver,
+            "var el = document.querySelector(args[1]);"
+            "return !!el && el.innerText.trim() !== '' && el.innerText.trim() !== args[0];",
+            [current_first, L.CARD_TITLE_CSS],
+            message="next page did not change the first product",
+            fallback=lambda drv: self.read_text(L.CARD_TITLE_CSS) not in ("", current_first),
         )
 
+    @timed
     def add_product_in_category(self, category: str, index: int = 0) -> str:
-        self.browse_category(category)
-        alert_text = add_product_by_index(self.driver, index)
-        return alert_text
+        """Add the category's index-th product: straight to its page via the catalog index."""
+        try:
+            product = get_catalog().in_category(category)[index]
+        except ProvisioningError:  # API unreachable: find the card through the UI
+            self.open()
+            self.browse_category(category)
+            return add_product_by_index(self.driver, index)
+        self.invalidate()
+        return add_product_by_id(self.driver, product["id"])
+
+    @timed
+    def open_product(self, product_id):
+        from .product_page import ProductPage
 
+        self.invalidate()
+        return ProductPage(self.driver, self.backend).open(product_id)
+
+    @timed
     def go_to_cart(self):
-        wait_click(self.driver, (By.ID, "cartur"))
-        WebDriverWait(self.driver, 10).until(EC.url_contains("cart"))
+        self.click(L.CART_LINK)
+        self.invalidate()
+        waits.until(self.driver, EC.url_contains("cart"), message="cart page did not open")
         from .cart_page import CartPage
 
-        return CartPage(self.driver)
+        return CartPage(self.driver, self.backend)
+
+
+class AsyncHomePage(AsyncBasePage):
+    """HomePage flows as coroutines over a CdpSession (many users per event loop)."""
+
+    async def open(self):
+        await self.session.goto(utils.BASE_URL)  # read now: use_site() may have switched sites
+        await self.wait_visible(L.CARDS)
+        return self
+
+    # Auth flows
+    async def register(self, username: str, password: str) -> str:
+        await self.click(L.SIGNUP_LINK)
+        await self.fill_form({L.SIGNUP_USERNAME: username, L.SIGNUP_PASSWORD: password})
+        await self.click(L.SIGNUP_SUBMIT)
+        return await self.wait_alert_and_accept()
+
+    async def login(self, username: str, password: str):
+        await self.click(L.LOGIN_LINK)
+        await self.fill_form({L.LOGIN_USERNAME: username, L.LOGIN_PASSWORD: password})
+        await self.click(L.LOGIN_SUBMIT)
+        await self.wait_text_in(L.WELCOME, f"Welcome {username}")
+        return self
+
+    async def logout(self):
+        await self.click(L.LOGOUT_LINK)
+        await self.wait_visible(L.LOGIN_LINK)
+        return self
+
+    # Catalog actions
+    async def browse_category(self, name: str):
+        # Mark the cards on screen so the wait cannot be satisfied by the old list
+        await self.session.wait_js(scripts.MARK_CARDS_JS, [L.CARD_CSS], message="no product cards", key="cards listed")
+        await self.click((By.LINK_TEXT, name))
+        await self.session.wait_js(
+            scripts.FRESH_CARDS_JS,
+            [L.CARD_CSS],
+            message=f"category {name} did not load",
+            key="category cards",
+        )
+        return self
+
+    async def cards(self):
+        """All product cards on the current page as [{title, price}]."""
+        await self.wait_visible(L.CARDS)
+        cards = await self.extract(L.CARD_CSS, {"title": ".card-title", "price": "h5"})
+        for card in cards:
+            card["price"] = to_price(card["price"])
+        return cards
+
+    async def add_product_in_category(self, category: str, index: int = 0) -> str:
+        """Add the category's index-th product (product page by id when the catalog is reachable)."""
+        try:
+            product = get_catalog().in_category(category)[index]
+        except ProvisioningError:
+            await self.browse_category(category)
+            await self.click((By.XPATH, f"(//div[@id='tbodyid']//h4[@class='card-title']/a)[{index + 1}]"))
+        else:
+            await self.session.goto(product_url(product["id"]))
+        await self.session.wait_js(
+            "var el = document.querySelector(args[0]); return !!el && el.innerText.trim() !== '';",
+            [L.PRODUCT_NAME_CSS],
+            message="product page did not load",
+        )
+        await self.click(L.ADD_TO_CART)
+        return await self.wait_alert_and_accept()
+
+    async def go_to_cart(self):
+        await self.click(L.CART_LINK)
+        await self.session.wait_url_contains("cart", message="cart page did not open")
+        from .cart_page import AsyncCartPage
+
+        return AsyncCartPage(self.session)
@@ -0,0 +1,27 @@
+from tests import locators as L
+from tests.instrumentation import timed
+from tests.pages.base_page import BasePage
+from tests.utils import open_product, to_price
+
+
+class ProductPage(BasePage):
+    """Product detail page, opened directly by id."""
+
+    @timed
+    def open(self, product_id):
+        self.invalidate()
+        open_product(self.driver, product_id)
+        return self
+
+    def name(self) -> str:
+        return self.read_text(L.PRODUCT_NAME_CSS)
+
+    def price(self) -> int:
+        # "$360 *includes tax"
+        text = self.read_text(L.PRODUCT_PRICE_CSS)
+        return to_price(text.split()[0] if text else "")
+
+    @timed
+    def add_to_cart(self) -> str:
+        self.click(L.ADD_TO_CART)
+        return self.wait_alert_and_accept()
@@ -0,0 +1,95 @@
+"""
+Helpers for running the suite across worker processes (pytest-xdist).
+
+Each xdist worker is its own process, so session fixtures (`fresh_user`,
+`session_driver`, the driver pool) are already per worker. This module adds
+the bookkeeping: worker ids, per-worker timing files and the merged report
+the controller writes at the end of the run.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from .utils import ROOT
+
+
+REPORT_DIR = ROOT / "reports"
+WORKER_DIR = REPORT_DIR / "workers"
+MERGED_REPORT = REPORT_DIR / "parallel_report.json"
+
+
+def worker_id() -> str:
+    """xdist worker name (gw0, gw1, ...) or 'main' for a serial run."""
+    return os.getenv("PYTEST_XDIST_WORKER", "main")
+
+
+def is_worker(config) -> bool:
+    return hasattr(config, "workerinput")
+
+
+def is_controller(config) -> bool:
+    return not is_worker(config) and bool(getattr(config.option, "numprocesses", None))
+
+
+class WorkerTimings:
+    """Collects per-test durations inside one process."""
+
+    def __init__(self):
+        self.worker = worker_id()
+        self.started = time.time()
+        self.tests = {}
+
+    def add(self, nodeid: str, duration: float, outcome: str):
+        entry = self.tests.setdefault(nodeid, {"duration": 0.0, "outcome": "passed"})
+        entry["duration"] += duration
+        if outcome != "passed":
+            entry["outcome"] = outcome
+
+    def dump(self, directory: Path = WORKER_DIR) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.worker}.json"
+        payload = {
+            "worker": self.worker,
+            "started": self.started,
+            "finished": time.time(),
+            "tests": self.tests,
+        }
+        path.write_text(json.dumps(payload, indent=2))
+        return path
+
+
+def clear_worker_files(directory: Path = WORKER_DIR):
+    if directory.exists():
+        for path in directory.glob("*.json"):
+            path.unlink()
+
+
+def merge_worker_files(wall_seconds: float, directory: Path = WORKER_DIR, out: Path = MERGED_REPORT) -> dict:
+    """Combine worker files into one report and compute scaling efficiency."""
+    workers = []
+    tests = {}
+    for path in sorted(directory.glob("*.json")):
+        data = json.loads(path.read_text())
+        busy = sum(t["duration"] for t in data["tests"].values())
+        workers.append({
+            "worker": data["worker"],
+            "tests": len(data["tests"]),
+            "busy_seconds": round(busy, 2),
+            "wall_seconds": round(data["finished"] - data["started"], 2),
+        })
+        for nodeid, entry in data["tests"].items():
+            tests[nodeid] = dict(entry, worker=data["worker"])
+    total_busy = sum(w["busy_seconds"] for w in workers)
+    report = {
+        "wall_seconds": round(wall_seconds, 2),
+        "serial_estimate_seconds": round(total_busy, 2),
+        "speedup": round(total_busy / wall_seconds, 2) if wall_seconds else 0.0,
+        "efficiency": round(total_busy / (wall_seconds * len(workers)), 2) if wall_seconds and workers else 0.0,
+        "workers": workers,
+        "tests": tests,
+    }
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    return report
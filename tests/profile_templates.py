@@ -0,0 +1,162 @@
+"""
+Pre-warmed Chrome user-data dirs ("golden templates").
+
+A brand-new profile makes Chrome create its directory layout, run first-run
+setup and fetch every static asset of the site. We do that once per
+(driver profile, site) in `.browser_templates/`, where the site is the
+scheme and host of the base URL without the port: the stand-in listens on a
+new port every run and still reuses one template (its assets are re-fetched
+from the new origin, the first-run setup is not): launch Chrome, load the
+home page so scripts, styles and images land in the HTTP cache, quit. Each
+session then starts from a clone of that template in a temp dir, which is
+deleted when the driver quits.
+
+Clones are copy-on-write where the filesystem allows it (`cp --reflink` on
+Linux, `cp -c` / clonefile on macOS) and a plain copy otherwise. Chrome
+rewrites its databases in place, so hardlinks would corrupt the template.
+
+Knobs (environment variables):
+- BROWSER_TEMPLATE              1 (default) | 0 = start every session from an empty dir
+- BROWSER_TEMPLATE_MAX_AGE_H    rebuild templates older than this (default 24)
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from . import driver_profiles
+
+
+TEMPLATE_DIR = driver_profiles.ROOT / ".browser_templates"
+MARKER = "template.json"
+# Per-process files Chrome leaves behind; a clone must not inherit them.
+_SINGLETONS = ("SingletonLock", "SingletonSocket", "SingletonCookie", "DevToolsActivePort")
+
+
+def enabled() -> bool:
+    return os.getenv("BROWSER_TEMPLATE", "1") != "0"
+
+
+def _max_age() -> float:
+    return float(os.getenv("BROWSER_TEMPLATE_MAX_AGE_H", "24")) * 3600
+
+
+def _site(base_url: str) -> str:
+    parts = urlparse(base_url)
+    return f"{parts.scheme}://{parts.hostname}"
+
+
+def template_path(name: str, base_url: str) -> Path:
+    digest = hashlib.sha256(_site(base_url).encode()).hexdigest()[:8]
+    return TEMPLATE_DIR / f"{name}-{digest}"
+
+
+def _is_fresh(path: Path, base_url: str) -> bool:
+    try:
+        info = json.loads((path / MARKER).read_text())
+    except (OSError, ValueError):
+        return False
+    return info.get("site") == _site(base_url) and time.time() - info["built"] < _max_age()
+
+
+def _build(name: str, base_url: str, target: Path):
+    """Launch Chrome on an empty dir, load the site, quit; then publish the dir."""
+    staging = Path(tempfile.mkdtemp(prefix=f"{target.name}.", dir=TEMPLATE_DIR))
+    started = time.perf_counter()
+    try:
+        service = Service(executable_path=driver_profiles.driver_path())
+        driver = webdriver.Chrome(service=service, options=driver_profiles.build_options(name, staging))
+        try:
+            driver.get(base_url)
+            driver.execute_async_script(
+                "const done = arguments[arguments.length - 1];"
+                "if (document.readyState === 'complete') done();"
+                "else window.addEventListener('load', () => done());"
+            )
+        finally:
+            driver.quit()  # flushes the HTTP cache to disk
+        for leftover in _SINGLETONS:
+            (staging / leftover).unlink(missing_ok=True)
+        marker = {"site": _site(base_url), "base_url": base_url, "built": time.time()}
+        (staging / MARKER).write_text(json.dumps(marker))
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(staging, target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    driver_profiles.STARTUP.add(f"{name} template build", time.perf_counter() - started)
+
+
+def _prune(keep: Path):
+    """Drop templates nobody has rebuilt lately (e.g. a site no longer tested)."""
+    cutoff = time.time() - _max_age()
+    for path in TEMPLATE_DIR.iterdir():
+        if path.is_dir() and path != keep and path.stat().st_mtime < cutoff:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def ensure_template(name: str, base_url: str) -> Path:
+    """Path of a fresh template for this profile and site; built once, shared across workers."""
+    target = template_path(name, base_url)
+    if _is_fresh(target, base_url):
+        return target
+    TEMPLATE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(target.with_suffix(".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if not _is_fresh(target, base_url):  # another worker may have built it meanwhile
+            _build(name, base_url, target)
+            _prune(target)
+        fcntl.flock(lock, fcntl.LOCK_UN)
+    return target
+
+
+def clone_tree(src: Path, dst: Path):
+    """Copy the contents of `src` into `dst`, sharing blocks with the source when possible."""
+    if sys.platform == "darwin":
+        command = ["cp", "-c", "-R", f"{src}/", str(dst)]
+    elif sys.platform.startswith("linux"):
+        command = ["cp", "-a", "--reflink=auto", f"{src}/.", str(dst)]
+    else:
+        command = None
+    if command is not None and subprocess.run(command, capture_output=True).returncode == 0:
+        return
+    shutil.copytree(src, dst, symlinks=True, dirs_exist_ok=True)
+
+
+def session_dir(name: str, base_url: str):
+    """
+    User-data dir for a new session of profile `name`, or None to let Chrome
+    pick its own (the "default" profile with templates off).
+    """
+    if not enabled() and name == "default":
+        return None
+    template = ensure_template(name, base_url) if enabled() else None
+    data_dir = Path(tempfile.mkdtemp(prefix="chrome-profile-", dir=driver_profiles.user_data_root(name)))
+    if template is not None:
+        clone_tree(template, data_dir)
+    return data_dir
+
+
+def existing_session_dir(name: str, base_url: str):
+    """
+    Like session_dir, but only clones a template that is already fresh and
+    never builds one (building needs Selenium + chromedriver). None when
+    there is nothing to clone.
+    """
+    target = template_path(name, base_url)
+    if not enabled() or not _is_fresh(target, base_url):
+        return None
+    data_dir = Path(tempfile.mkdtemp(prefix="chrome-profile-", dir=driver_profiles.user_data_root(name)))
+    clone_tree(target, data_dir)
+    return data_dir
@@ -0,0 +1,107 @@
+"""
+WebDriver command profiler.
+
+Every chromedriver round trip goes through `driver.command_executor.execute`.
+`attach()` wraps that call once per driver and records each command's name,
+duration and the tests/ helper that issued it into the driver's current
+`Profile`. conftest swaps in a fresh profile per test and enforces
+@pytest.mark.command_budget(n) on the test body. A profile started with
+`trace=True` also keeps every command in order (params, start, result size)
+for tests/traces.py.
+"""
+
+import os
+import sys
+import time
+
+from . import traces
+
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+# Plumbing between a helper and the driver: report the helper instead
+_SKIP_FILES = {
+    os.path.join(_HERE, name)
+    for name in ("profiler.py", "instrumentation.py", "waits.py", os.path.join("backends", "selenium_backend.py"))
+}
+
+
+class Profile:
+    """Commands issued while this profile was active."""
+
+    def __init__(self, trace: bool = False):
+        self.total = 0
+        self.seconds = 0.0
+        self.by_command = {}
+        self.by_helper = {}
+        self.origin = time.perf_counter()
+        # (command, params, helper, start, seconds, size) per command; formatted only when written
+        self.trace = [] if trace else None
+
+    def add(self, command: str, helper: str, seconds: float, params=None, started=None, size=0):
+        self.total += 1
+        self.seconds += seconds
+        if self.trace is not None:
+            self.trace.append((command, params, helper, (started or self.origin) - self.origin, seconds, size))
+        for table, key in ((self.by_command, command), (self.by_helper, helper)):
+            entry = table.setdefault(key, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def as_dict(self) -> dict:
+        def table(data):
+            ordered = sorted(data.items(), key=lambda kv: -kv[1][0])
+            return {key: {"count": n, "seconds": round(secs, 3)} for key, (n, secs) in ordered}
+
+        return {
+            "total": self.total,
+            "seconds": round(self.seconds, 3),
+            "by_command": table(self.by_command),
+            "by_helper": table(self.by_helper),
+        }
+
+    def top(self, n=5) -> str:
+        ordered = sorted(self.by_helper.items(), key=lambda kv: -kv[1][0])[:n]
+        return ", ".join(f"{helper} x{count}" for helper, (count, _secs) in ordered)
+
+
+def calling_helper() -> str:
+    """Name of the innermost public function in tests/ that led to this command (lambdas skipped)."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(_HERE)
+            and filename not in _SKIP_FILES
+            and not frame.f_code.co_name.startswith(("_", "<"))
+        ):
+            return f"{os.path.basename(filename)[:-3]}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<outside tests>"
+
+
+def attach(driver, trace: bool = False) -> Profile:
+    """Start profiling `driver` (idempotent); returns a fresh active profile."""
+    executor = driver.command_executor
+    if not getattr(executor, "_profiled", False):
+        original = executor.execute
+
+        def execute(command, params):
+            started = time.perf_counter()
+            response = None
+            try:
+                response = original(command, params)
+                return response
+            finally:
+                profile = getattr(executor, "profile", None)
+                if profile is not None:
+                    size = traces.result_size(response) if profile.trace is not None else 0
+                    profile.add(command, calling_helper(), time.perf_counter() - started, params, started, size)
+
+        executor.execute = execute
+        executor._profiled = True
+    executor.profile = Profile(trace)
+    return executor.profile
+
+
+def current(driver) -> Profile:
+    return getattr(driver.command_executor, "profile", None)
@@ -0,0 +1,241 @@
+"""
+Fast user provisioning over HTTP, plus an on-disk pool of ready-made users.
+
+The Demoblaze front-end signs users up with one JSON POST to its API, so we
+do the same instead of starting a browser. Created users are kept in
+`.user_pool.json` and leased to test sessions (one lease per session/worker)
+so most runs do not create anyone at all. A reused user's server-side cart
+is emptied when it is leased, so tests only see what they add themselves.
+
+Knobs (environment variables):
+- USER_POOL_MIN        free users to keep in stock (default 2)
+- USER_POOL_MAX_AGE_H  drop pooled users older than this many hours (default 72)
+- USER_LEASE_MINUTES   lease expiry, so crashed runs do not hold users forever
+"""
+
+import base64
+import fcntl
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import utils
+from .utils import ROOT, generate_username
+
+
+DEFAULT_PASSWORD = "Password123!"
+POOL_FILE = ROOT / ".user_pool.json"
+AUTH_COOKIE = "tokenp_"
+
+_session = None
+_tokens = {}
+
+
+class ProvisioningError(Exception):
+    """Raised when the API cannot create or log in a user."""
+
+
+def http_session() -> requests.Session:
+    """Shared keep-alive session (one TCP/TLS handshake for the whole run)."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        _session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+    return _session
+
+
+def encode_password(password: str) -> str:
+    """The site base64-encodes passwords client-side before posting them."""
+    return base64.b64encode(password.encode()).decode()
+
+
+def api_post(path: str, payload: dict, timeout=10):
+    try:
+        resp = http_session().post(f"{utils.API_URL}/{path}", json=payload, timeout=timeout)
+        resp.raise_for_status()
+    except requests.RequestException as exc:
+        raise ProvisioningError(f"{path} failed: {exc}") from exc
+    return resp.json() if resp.content else None
+
+
+def signup_via_api(username: str, password: str) -> str:
+    """Create a user; returns the same text the UI alert would show."""
+    body = api_post("signup", {"username": username, "password": encode_password(password)})
+    if isinstance(body, dict) and body.get("errorMessage"):
+        raise ProvisioningError(body["errorMessage"])
+    return "Sign up successful."
+
+
+def login_via_api(username: str, password: str) -> str:
+    """Return an auth token for the user; cached for the rest of the process."""
+    key = (username, password)
+    if key not in _tokens:
+        body = api_post("login", {"username": username, "password": encode_password(password)})
+        if isinstance(body, dict) and body.get("errorMessage"):
+            raise ProvisioningError(body["errorMessage"])
+        if not isinstance(body, str) or "Auth_token:" not in body:
+            raise ProvisioningError(f"unexpected login response: {body!r}")
+        _tokens[key] = body.split("Auth_token:", 1)[1].strip()
+    return _tokens[key]
+
+
+def inject_auth_cookie(driver, token: str):
+    """Set the site's auth cookie before any page of the site is loaded."""
+    driver.execute_cdp_cmd(
+        "Network.setCookie",
+        {"name": AUTH_COOKIE, "value": token, "url": utils.BASE_URL, "path": "/"},
+    )
+
+
+def fast_login(driver, username: str, password: str):
+    """Open home already signed in (no modal); falls back to the UI login."""
+    try:
+        token = login_via_api(username, password)
+    except ProvisioningError:
+        utils.open_home(driver)
+        utils.login(driver, username, password)
+        return
+    inject_auth_cookie(driver, token)
+    utils.open_home(driver)
+    utils.wait_welcome(driver, username)
+
+
+def session_token(driver) -> str:
+    """Auth token of the user signed in to this browser (fast or UI login)."""
+    cookie = driver.get_cookie(AUTH_COOKIE)
+    if not cookie:
+        raise ProvisioningError("browser is not signed in (no auth cookie)")
+    return cookie["value"]
+
+
+def fan_out(path: str, payloads: list):
+    """POST the same endpoint for many payloads concurrently over the shared session."""
+    if not payloads:
+        return []
+    with ThreadPoolExecutor(max_workers=min(8, len(payloads))) as pool:
+        return list(pool.map(lambda payload: api_post(path, payload), payloads))
+
+
+def cart_items(token: str) -> list:
+    """The user's cart entries as the API returns them ({id, prod_id, ...})."""
+    body = api_post("viewcart", {"cookie": token, "flag": True}) or {}
+    return body.get("Items", [])
+
+
+def clear_cart(token: str):
+    """Remove every item from the user's cart."""
+    fan_out("deleteitem", [{"id": item["id"]} for item in cart_items(token)])
+
+
+def seed_cart(driver, product_ids, clear: bool = False):
+    """
+    Put products straight into the signed-in user's cart via the backend.
+    The API has no bulk endpoint, so the adds go out concurrently on the
+    pooled session - one round of requests instead of one page visit each.
+    Navigate to (or refresh) the cart page afterwards to see them.
+    """
+    token = session_token(driver)
+    if clear:
+        clear_cart(token)
+    fan_out(
+        "addtocart",
+        [{"id": str(uuid.uuid4()), "cookie": token, "prod_id": int(pid), "flag": True} for pid in product_ids],
+    )
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class UserPool:
+    """JSON-file pool of users with leases; safe across processes via flock."""
+
+    def __init__(self, path: Path = POOL_FILE):
+        self.path = path
+        self.min_free = int(_env_number("USER_POOL_MIN", 2))
+        self.max_age = _env_number("USER_POOL_MAX_AGE_H", 72) * 3600
+        self.lease_seconds = _env_number("USER_LEASE_MINUTES", 60) * 60
+
+    @contextmanager
+    def _locked(self):
+        lock_path = self.path.with_suffix(".lock")
+        with open(lock_path, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            users = json.loads(self.path.read_text()) if self.path.exists() else []
+            now = time.time()
+            users = [u for u in users if now - u["created"] < self.max_age]
+            yield users
+            self.path.write_text(json.dumps(users, indent=2))
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _is_free(self, user, now):
+        # users signed up on another deployment (live site vs stand-in) stay in the file untouched
+        if user.get("api") != utils.API_URL:
+            return False
+        return not user.get("leased_by") or user.get("lease_expires", 0) < now
+
+    def lease(self, owner: str):
+        """Return a free user (marked as leased by `owner`), or None if empty."""
+        with self._locked() as users:
+            now = time.time()
+            for user in users:
+                if self._is_free(user, now):
+                    user["leased_by"] = owner
+                    user["lease_expires"] = now + self.lease_seconds
+                    return {"username": user["username"], "password": user["password"]}
+        return None
+
+    def release(self, username: str):
+        with self._locked() as users:
+            for user in users:
+                if user["username"] == username:
+                    user.pop("leased_by", None)
+                    user.pop("lease_expires", None)
+
+    def add(self, username: str, password: str, leased_by: str = None):
+        with self._locked() as users:
+            entry = {"username": username, "password": password, "created": time.time(), "api": utils.API_URL}
+            if leased_by:
+                entry["leased_by"] = leased_by
+                entry["lease_expires"] = time.time() + self.lease_seconds
+            users.append(entry)
+
+    def free_count(self) -> int:
+        with self._locked() as users:
+            now = time.time()
+            return sum(1 for u in users if self._is_free(u, now))
+
+    def replenish(self):
+        """Top the pool up to `min_free` users via the API."""
+        for _ in range(max(0, self.min_free - self.free_count())):
+            username = generate_username()
+            signup_via_api(username, DEFAULT_PASSWORD)
+            self.add(username, DEFAULT_PASSWORD)
+
+
+def lease_user(owner: str, pool: UserPool = None) -> dict:
+    """Lease a pooled user (cart emptied), creating one over HTTP when the pool is empty."""
+    pool = pool or UserPool()
+    user = pool.lease(owner)
+    if user:
+        try:
+            clear_cart(login_via_api(user["username"], user["password"]))
+        except ProvisioningError:
+            pool.release(user["username"])
+            raise
+        return dict(user, alert_text="leased from user pool")
+    username = generate_username()
+    alert_text = signup_via_api(username, DEFAULT_PASSWORD)
+    pool.add(username, DEFAULT_PASSWORD, leased_by=owner)
+    return {"username": username, "password": DEFAULT_PASSWORD, "alert_text": alert_text}
@@ -0,0 +1,176 @@
+"""
+Duration history and history-aware test ordering.
+
+Every run appends each test's duration and outcome to `.test_history.json`
+(flock-protected, so xdist workers can write at the same time). At
+collection the suite is reordered:
+
+1. tests that failed in one of their recent runs come first (quick feedback);
+2. then longest expected duration first. xdist hands tests out in
+   collection order, so the long flows start early instead of deciding the
+   wall clock at the end.
+
+With a time budget only the most valuable subset whose expected duration
+fits (budget x workers) is run; the rest is deselected. Recent failures,
+flaky and never-timed tests are worth more.
+
+Knobs (environment variables):
+- TEST_ORDER        history (default) | file = keep collection order
+- TIME_BUDGET_MIN   run only what fits in this many minutes of wall time
+- TEST_HISTORY_RUNS runs kept per test (default 10)
+"""
+
+import fcntl
+import json
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from .utils import ROOT
+
+
+HISTORY_FILE = ROOT / ".test_history.json"
+RECENT_RUNS = 3  # "recently failed" = failed in one of the last N runs
+UNKNOWN_SECONDS = 5.0  # expected duration when nothing is known at all
+
+
+class DurationStore:
+    """Per-test run history: {nodeid: [[seconds, outcome, timestamp], ...]} (oldest first)."""
+
+    def __init__(self, path: Path = HISTORY_FILE):
+        self.path = path
+        self.keep = int(os.getenv("TEST_HISTORY_RUNS", "10"))
+        self.history = self._read()
+
+    def _read(self) -> dict:
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    @contextmanager
+    def _locked(self):
+        with open(self.path.with_suffix(".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            history = self._read()
+            yield history
+            self.path.write_text(json.dumps(history, indent=1))
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def record(self, results: dict):
+        """Append {nodeid: {"duration": s, "outcome": o}} from this process."""
+        if not results:
+            return
+        now = time.time()
+        with self._locked() as history:
+            for nodeid, entry in results.items():
+                runs = history.setdefault(nodeid, [])
+                runs.append([round(entry["duration"], 3), entry["outcome"], now])
+                del runs[: -self.keep]
+            self.history = dict(history)
+
+    # ---- queries ----
+    def known(self, nodeid: str) -> bool:
+        return bool(self.history.get(nodeid))
+
+    def expected(self, nodeid: str) -> float:
+        runs = self.history.get(nodeid)
+        if runs:
+            return statistics.median(r[0] for r in runs)
+        known = [statistics.median(r[0] for r in runs) for runs in self.history.values() if runs]
+        return statistics.median(known) if known else UNKNOWN_SECONDS
+
+    def recently_failed(self, nodeid: str) -> bool:
+        return any(r[1] == "failed" for r in self.history.get(nodeid, [])[-RECENT_RUNS:])
+
+    def flaky(self, nodeid: str) -> bool:
+        return len({r[1] for r in self.history.get(nodeid, [])} & {"passed", "failed"}) == 2
+
+    def value(self, nodeid: str) -> float:
+        """How much running this test tells us (used by the time budget)."""
+        score = 1.0
+        if self.recently_failed(nodeid):
+            score += 3
+        elif self.flaky(nodeid):
+            score += 1
+        if not self.known(nodeid):
+            score += 2
+        return score
+
+
+def order(items, store: DurationStore):
+    """Recent failures first, then longest first; stable on nodeid for xdist."""
+    items.sort(key=lambda it: (not store.recently_failed(it.nodeid), -store.expected(it.nodeid), it.nodeid))
+
+
+def worker_count(config) -> int:
+    n = getattr(config.option, "numprocesses", None)
+    if not n:
+        return 1
+    if isinstance(n, int):
+        return n
+    return os.cpu_count() or 1  # -n auto / logical
+
+
+def select_within(items, store: DurationStore, budget_seconds: float):
+    """Split into (kept, dropped): best value per expected second that fits the budget."""
+    ranked = sorted(items, key=lambda it: (-store.value(it.nodeid) / max(store.expected(it.nodeid), 0.1), it.nodeid))
+    kept, dropped, used = set(), [], 0.0
+    for item in ranked:
+        cost = store.expected(item.nodeid)
+        if used + cost <= budget_seconds:
+            kept.add(item.nodeid)
+            used += cost
+        else:
+            dropped.append(item)
+    return [it for it in items if it.nodeid in kept], dropped, used
+
+
+class Plan:
+    """What the scheduler did this run, for the terminal summary."""
+
+    def __init__(self):
+        self.ordered = False
+        self.tests = 0
+        self.with_history = 0
+        self.failed_first = 0
+        self.budget_seconds = None
+        self.selected = 0
+        self.estimated_seconds = 0.0
+
+    def summary(self) -> str:
+        line = (
+            f"schedule: {self.tests} tests ordered by history ({self.with_history} timed before), "
+            f"{self.failed_first} recent failures first"
+        )
+        if self.budget_seconds is not None:
+            line += (
+                f"; time budget {self.budget_seconds / 60:.0f} min kept {self.selected} tests "
+                f"(~{self.estimated_seconds:.0f}s of work)"
+            )
+        return line
+
+
+def plan_collection(config, items, store: DurationStore = None) -> Plan:
+    """Reorder `items` in place (and apply TIME_BUDGET_MIN); returns what was done."""
+    plan = Plan()
+    if os.getenv("TEST_ORDER", "history").lower() != "history" or not items:
+        return plan
+    store = store or DurationStore()
+    budget = os.getenv("TIME_BUDGET_MIN")
+    if budget:
+        plan.budget_seconds = float(budget) * 60
+        kept, dropped, used = select_within(items, store, plan.budget_seconds * worker_count(config))
+        if dropped:
+            config.hook.pytest_deselected(items=dropped)
+            items[:] = kept
+        plan.selected = len(items)
+        plan.estimated_seconds = used
+    order(items, store)
+    plan.ordered = True
+    plan.tests = len(items)
+    plan.with_history = sum(store.known(it.nodeid) for it in items)
+    plan.failed_first = sum(store.recently_failed(it.nodeid) for it in items)
+    return plan
@@ -0,0 +1,119 @@
+"""
+In-page scripts shared by waits.py, utils.py, the page objects and the CDP
+backend (one definition each).
+
+ASYNC_WAIT_JS is the body of an async script: `arguments[0]` are the check's
+args, `arguments[1]` the timeout in ms and the last argument the callback.
+The check (spliced in at /*CHECK*/) sees `args`, `__find(by, value)` and
+`__visible(el)`. The other scripts are check bodies (FILL_JS,
+EXTRACT_WAIT_JS, MARK_CARDS_JS) or plain scripts (EXTRACT_JS).
+"""
+
+
+FIND_JS = """
+function __find(by, value) {
+    if (by === 'id') return document.getElementById(value);
+    if (by === 'css selector') return document.querySelector(value);
+    if (by === 'name') return document.querySelector('[name="' + value + '"]');
+    if (by === 'tag name') return document.getElementsByTagName(value)[0] || null;
+    if (by === 'class name') return document.getElementsByClassName(value)[0] || null;
+    if (by === 'xpath') return document.evaluate(value, document, null, 9, null).singleNodeValue;
+    if (by === 'link text' || by === 'partial link text') {
+        var links = document.getElementsByTagName('a');
+        for (var i = 0; i < links.length; i++) {
+            var text = links[i].innerText.trim();
+            if (by === 'link text' ? text === value : text.indexOf(value) !== -1) return links[i];
+        }
+    }
+    return null;
+}
+function __visible(el) {
+    if (!el || !el.isConnected || !el.getClientRects().length) return false;
+    for (var node = el; node && node.nodeType === 1; node = node.parentElement) {
+        var style = getComputedStyle(node);
+        if (style.visibility === 'hidden' || style.display === 'none' || style.opacity === '0') return false;
+    }
+    return true;
+}
+"""
+
+ASYNC_WAIT_JS = FIND_JS + """
+var done = arguments[arguments.length - 1];
+var args = arguments[0];
+var timeoutMs = arguments[1];
+var check = function (args) { /*CHECK*/ };
+var finished = false, observer = null, ticker = null, timer = null;
+function finish(result) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearInterval(ticker);
+    clearTimeout(timer);
+    done(result);
+}
+function probe() {
+    var result;
+    try { result = check(args); } catch (e) { result = null; }
+    if (result) finish(result);
+}
+probe();
+if (!finished) {
+    observer = new MutationObserver(probe);
+    observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    ticker = setInterval(probe, 50);
+    timer = setTimeout(function () { finish(null); }, timeoutMs);
+}
+"""
+
+FILL_JS = """
+var fields = args[0];
+var elements = [];
+for (var i = 0; i < fields.length; i++) {
+    var el = __find(fields[i][0], fields[i][1]);
+    if (!__visible(el) || el.disabled) return null;
+    elements.push(el);
+}
+elements.forEach(function (el, i) {
+    // The prototype's setter, so frameworks tracking .value notice the change
+    var descriptor = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value');
+    el.focus();
+    if (descriptor && descriptor.set) { descriptor.set.call(el, fields[i][2]); } else { el.value = fields[i][2]; }
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    el.blur();
+});
+return true;
+"""
+
+
+EXTRACT_JS = """
+var rows = document.querySelectorAll(arguments[0]);
+var fields = arguments[1];
+var withElements = arguments[2];
+return Array.prototype.map.call(rows, function (row) {
+    var out = {};
+    Object.keys(fields).forEach(function (key) {
+        var el = fields[key] ? row.querySelector(fields[key]) : row;
+        out[key] = el ? el.innerText.trim() : null;
+    });
+    if (withElements) { out.element = row; }
+    return out;
+});
+"""
+
+
+# EXTRACT_JS as an in-page wait: resolves with the rows once there are any
+EXTRACT_WAIT_JS = "var rows = (function () {" + EXTRACT_JS + "}).apply(null, args); return rows.length ? rows : null;"
+
+
+# Marks the cards on screen (once there are any) so a later wait can tell them from a re-rendered list
+MARK_CARDS_JS = """
+var cards = document.querySelectorAll(args[0]);
+if (!cards.length) return false;
+cards.forEach(function (card) { card.__stale = true; });
+return true;
+"""
+
+
+# ...and resolves once the list on screen is a new one (first card not marked)
+FRESH_CARDS_JS = "var cards = document.querySelectorAll(args[0]); return cards.length > 0 && !cards[0].__stale;"
@@ -0,0 +1,181 @@
+"""
+Staged, checkpointed flows for long single-session journeys.
+
+A flow is a list of named stages. Each stage returns the state it produces
+(credentials, cart contents, ...). After every stage the runner snapshots
+that state together with the browser's cookies and URL:
+
+- a failing stage is retried after restoring the last good checkpoint
+  (fresh tab, cookies put back, same page), not the whole journey;
+  state that lives on the server (e.g. the cart) is put back by the
+  flow's @flow.on_restore hooks, which see the checkpoint's state;
+- if it still fails, the checkpoint is written to
+  `reports/checkpoints/<flow>-<worker>.json`, and the next run of the flow
+  resumes after the last completed stage instead of starting over.
+  A successful run deletes the file.
+
+Per-stage timings become Allure steps, an Allure JSON attachment and the
+test's `user_properties` ("stages").
+
+Knobs (environment variables):
+- FLOW_RESUME                   1 (default) | 0 = always start from the first stage
+- FLOW_STAGE_RETRIES            extra attempts per stage (default 1)
+- FLOW_CHECKPOINT_MAX_AGE_MIN   ignore older checkpoints (default 60)
+"""
+
+import json
+import os
+import time
+
+import allure
+from selenium.common.exceptions import WebDriverException
+
+from . import utils
+from .driver_pool import reset_session
+from .parallel import REPORT_DIR, worker_id
+
+
+CHECKPOINT_DIR = REPORT_DIR / "checkpoints"
+
+
+class StageError(AssertionError):
+    """A stage did not produce the state it declared."""
+
+
+class Stage:
+    def __init__(self, name, func, produces=(), retries=None):
+        self.name = name
+        self.func = func
+        self.produces = tuple(produces)
+        self.retries = int(os.getenv("FLOW_STAGE_RETRIES", "1")) if retries is None else retries
+
+
+class Context:
+    """What a stage sees: the browser and the state produced so far."""
+
+    def __init__(self, driver, state):
+        self.driver = driver
+        self.state = state
+
+    def __getitem__(self, key):
+        return self.state[key]
+
+
+class StagedFlow:
+    """Declare stages with @flow.stage(...), then call run()."""
+
+    def __init__(self, driver, name, node=None):
+        self.driver = driver
+        self.name = name
+        self.node = node
+        self.stages = []
+        self.restore_hooks = []
+        self.timings = []
+        self.path = CHECKPOINT_DIR / f"{name}-{worker_id()}.json"
+
+    def stage(self, name, produces=(), retries=None):
+        def register(func):
+            self.stages.append(Stage(name, func, produces, retries))
+            return func
+
+        return register
+
+    def on_restore(self, func):
+        """Register func(ctx), run after every restore to put back server-side state."""
+        self.restore_hooks.append(func)
+        return func
+
+    # ---- checkpoints ----
+    def _snapshot(self, completed, state):
+        return {
+            "flow": self.name,
+            "completed": completed,
+            "state": dict(state),
+            "cookies": self.driver.get_cookies(),
+            "url": self.driver.current_url,
+            "base_url": utils.BASE_URL,
+            "saved": time.time(),
+        }
+
+    def _load(self):
+        if os.getenv("FLOW_RESUME", "1") == "0" or not self.path.exists():
+            return None
+        try:
+            checkpoint = json.loads(self.path.read_text())
+        except ValueError:
+            return None
+        max_age = float(os.getenv("FLOW_CHECKPOINT_MAX_AGE_MIN", "60")) * 60
+        if checkpoint.get("base_url") != utils.BASE_URL or time.time() - checkpoint["saved"] > max_age:
+            return None
+        return checkpoint
+
+    def _save(self, checkpoint):
+        CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(checkpoint, indent=2))
+
+    def restore(self, checkpoint):
+        """Put the browser (and, through the hooks, the server) back where `checkpoint` left it."""
+        reset_session(self.driver)  # also re-applies per-tab hooks
+        if not checkpoint["cookies"]:
+            return
+        utils.open_home(self.driver)
+        for cookie in checkpoint["cookies"]:
+            self.driver.add_cookie(cookie)
+        for hook in self.restore_hooks:
+            hook(Context(self.driver, dict(checkpoint["state"])))
+        self.driver.get(checkpoint["url"])
+
+    # ---- running ----
+    def _record(self, stage, status, seconds, attempts):
+        self.timings.append(
+            {"stage": stage.name, "status": status, "seconds": round(seconds, 3), "attempts": attempts}
+        )
+
+    def _run_stage(self, stage, state, checkpoint):
+        started = time.perf_counter()
+        for attempt in range(1, stage.retries + 2):
+            try:
+                with allure.step(f"stage {stage.name}" + (f" (attempt {attempt})" if attempt > 1 else "")):
+                    produced = stage.func(Context(self.driver, state)) or {}
+                missing = [key for key in stage.produces if key not in produced]
+                if missing:
+                    raise StageError(f"stage {stage.name!r} did not produce {', '.join(missing)}")
+                self._record(stage, "passed", time.perf_counter() - started, attempt)
+                return produced
+            except (AssertionError, WebDriverException):
+                if attempt > stage.retries:
+                    self._record(stage, "failed", time.perf_counter() - started, attempt)
+                    raise
+                self.restore(checkpoint)
+
+    def run(self) -> dict:
+        """Run (or resume) every stage; returns the final state."""
+        checkpoint = self._load()
+        done = set(checkpoint["completed"]) if checkpoint else set()
+        if checkpoint:
+            self.restore(checkpoint)
+        else:
+            checkpoint = self._snapshot([], {})
+        state = dict(checkpoint["state"])
+        try:
+            for stage in self.stages:
+                if stage.name in done:
+                    self._record(stage, "resumed", 0.0, 0)
+                    continue
+                try:
+                    state.update(self._run_stage(stage, state, checkpoint))
+                except BaseException:
+                    self._save(checkpoint)
+                    raise
+                checkpoint = self._snapshot(checkpoint["completed"] + [stage.name], state)
+            self.path.unlink(missing_ok=True)
+            return state
+        finally:
+            self._report()
+
+    def _report(self):
+        allure.attach(
+            json.dumps(self.timings, indent=2), name="stage timings", attachment_type=allure.attachment_type.JSON
+        )
+        if self.node is not None:
+            self.node.user_properties.append(("stages", self.timings))
@@ -0,0 +1,8 @@
+"""
+Offline stand-in for the Demoblaze site (pages + JSON API) used for
+deterministic, low-latency and benchmark runs.
+"""
+
+from .server import StandInServer
+
+__all__ = ["StandInServer"]
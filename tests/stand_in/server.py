@@ -0,0 +1,242 @@
+"""
+Local stand-in for www.demoblaze.com and api.demoblaze.com.
+
+Serves the pages in `static/` and the JSON endpoints they (and
+`tests/provisioning.py`) call, all from one in-memory store. Page and API
+responses can be delayed to benchmark the suite under controlled latency.
+
+Run standalone:
+    python -m tests.stand_in.server --port 8000 --api-latency-ms 80 --jitter-ms 20
+"""
+
+import argparse
+import json
+import mimetypes
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+
+HERE = Path(__file__).resolve().parent
+STATIC_DIR = HERE / "static"
+CATALOG = json.loads((HERE / "catalog.json").read_text())
+PAGE_SIZE = 9
+PLACEHOLDER_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="120" height="120">'
+    '<rect width="120" height="120" fill="#ccc"/><text x="10" y="65">{id}</text></svg>'
+)
+
+
+class Store:
+    """Users, tokens and cart items for one server instance."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = {}
+        self.tokens = {}
+        self.cart = []
+        self.products = {p["id"]: p for p in CATALOG}
+
+    def owner(self, cookie: str) -> str:
+        # Carts follow the user, not the individual token.
+        return self.tokens.get(cookie, cookie)
+
+    def signup(self, body):
+        with self.lock:
+            if body["username"] in self.users:
+                return {"errorMessage": "This user already exist."}
+            self.users[body["username"]] = body["password"]
+        return ""
+
+    def login(self, body):
+        with self.lock:
+            stored = self.users.get(body["username"])
+            if stored is None:
+                return {"errorMessage": "User does not exist."}
+            if stored != body["password"]:
+                return {"errorMessage": "Wrong password."}
+            token = uuid.uuid4().hex
+            self.tokens[token] = body["username"]
+        return f"Auth_token: {token}"
+
+    def check(self, body):
+        username = self.tokens.get(body.get("token"))
+        if not username:
+            return {"errorMessage": "Token has expired."}
+        return {"Item": {"token": body["token"], "username": username}}
+
+    def entries(self, _body=None):
+        items = CATALOG[:PAGE_SIZE]
+        return {"Items": items, "LastEvaluatedKey": {"id": str(items[-1]["id"])}}
+
+    def pagination(self, body):
+        after = int(body.get("id", PAGE_SIZE))
+        return {"Items": [p for p in CATALOG if p["id"] > after][:PAGE_SIZE]}
+
+    def bycat(self, body):
+        return {"Items": [p for p in CATALOG if p["cat"] == body.get("cat")]}
+
+    def view(self, body):
+        return self.products.get(int(body["id"]), {})
+
+    def addtocart(self, body):
+        with self.lock:
+            self.cart.append({
+                "id": body.get("id") or str(uuid.uuid4()),
+                "cookie": self.owner(body["cookie"]),
+                "prod_id": int(body["prod_id"]),
+            })
+        return ""
+
+    def viewcart(self, body):
+        owner = self.owner(body["cookie"])
+        with self.lock:
+            return {"Items": [dict(i) for i in self.cart if i["cookie"] == owner]}
+
+    def deleteitem(self, body):
+        with self.lock:
+            self.cart = [i for i in self.cart if i["id"] != body["id"]]
+        return ""
+
+    def deletecart(self, body):
+        owner = self.owner(body["cookie"])
+        with self.lock:
+            self.cart = [i for i in self.cart if i["cookie"] != owner]
+        return ""
+
+
+API_ROUTES = {
+    "signup", "login", "check", "entries", "pagination", "bycat", "view",
+    "addtocart", "viewcart", "deleteitem", "deletecart",
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "DemoblazeStandIn/1.0"
+
+    def log_message(self, fmt, *args):  # keep pytest output clean
+        pass
+
+    def _delay(self, kind: str):
+        base = self.server.latency[kind]
+        jitter = self.server.latency["jitter"]
+        delay = base + (random.uniform(0, jitter) if jitter else 0)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "max-age=3600" if content_type != "application/json" else "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _api(self, name: str, body: dict):
+        self._delay("api")
+        if name not in API_ROUTES:
+            self._send(404, b'{"errorMessage": "Not found"}', "application/json")
+            return
+        try:
+            result = getattr(self.server.store, name)(body)
+        except (KeyError, TypeError, ValueError):
+            self._send(400, b'{"errorMessage": "Bad request"}', "application/json")
+            return
+        self._send(200, json.dumps(result).encode(), "application/json")
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path.startswith("/api/"):
+            self._api(path[len("/api/"):], {})
+            return
+        self._delay("page")
+        if path in ("", "/"):
+            path = "/index.html"
+        if path.startswith("/imgs/"):
+            body = PLACEHOLDER_SVG.format(id=Path(path).stem).encode()
+            self._send(200, body, "image/svg+xml")
+            return
+        if path.startswith("/media/"):
+            self._send(200, bytes(64 * 1024), "video/mp4")
+            return
+        target = (STATIC_DIR / path.lstrip("/")).resolve()
+        if STATIC_DIR not in target.parents or not target.is_file():
+            self._send(404, b"not found", "text/plain")
+            return
+        content_type = mimetypes.guess_type(str(target))[0] or "application/octet-stream"
+        self._send(200, target.read_bytes(), content_type)
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b"{}"
+        try:
+            body = json.loads(raw or b"{}")
+        except ValueError:
+            self._send(400, b'{"errorMessage": "Bad JSON"}', "application/json")
+            return
+        if not path.startswith("/api/"):
+            self._send(404, b"not found", "text/plain")
+            return
+        self._api(path[len("/api/"):], body)
+
+
+class StandInServer:
+    """Threaded server you can start in-process (port 0 = pick a free port)."""
+
+    def __init__(self, host="127.0.0.1", port=0, page_latency_ms=0, api_latency_ms=0, jitter_ms=0):
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.store = Store()
+        self.httpd.latency = {"page": page_latency_ms, "api": api_latency_ms, "jitter": jitter_ms}
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.url}/api"
+
+    def set_latency(self, page_ms=None, api_ms=None, jitter_ms=None):
+        """Change latency while running (e.g. between benchmark rounds)."""
+        for key, value in (("page", page_ms), ("api", api_ms), ("jitter", jitter_ms)):
+            if value is not None:
+                self.httpd.latency[key] = value
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="stand-in", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local Demoblaze stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--page-latency-ms", type=float, default=0)
+    parser.add_argument("--api-latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    args = parser.parse_args(argv)
+    server = StandInServer(args.host, args.port, args.page_latency_ms, args.api_latency_ms, args.jitter_ms)
+    print(f"Demoblaze stand-in on {server.url} (API {server.api_url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
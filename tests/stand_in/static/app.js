@@ -0,0 +1,286 @@
+// Minimal stand-in for the Demoblaze front-end: same ids, texts and alerts
+// the page objects rely on, backed by the local JSON API under /api.
+(function () {
+  "use strict";
+
+  var API = "/api";
+  var PAGE_SIZE = 9;
+
+  var HEADER =
+    '<nav class="navbar" id="narvbarx">' +
+    '  <a class="navbar-brand" id="nava" href="index.html">PRODUCT STORE</a>' +
+    '  <ul class="navbar-nav">' +
+    '    <li class="nav-item"><a class="nav-link" href="index.html">Home</a></li>' +
+    '    <li class="nav-item"><a class="nav-link" href="#" data-target="#exampleModal">Contact</a></li>' +
+    '    <li class="nav-item"><a class="nav-link" href="#" data-target="#videoModal">About us</a></li>' +
+    '    <li class="nav-item"><a class="nav-link" id="cartur" href="cart.html">Cart</a></li>' +
+    '    <li class="nav-item"><a class="nav-link" id="login2" href="#" data-target="#logInModal">Log in</a></li>' +
+    '    <li class="nav-item"><a class="nav-link" id="logout2" href="#" style="display:none">Log out</a></li>' +
+    '    <li class="nav-item"><a class="nav-link" id="nameofuser" href="#" style="display:none"></a></li>' +
+    '    <li class="nav-item"><a class="nav-link" id="signin2" href="#" data-target="#signInModal">Sign up</a></li>' +
+    "  </ul>" +
+    "</nav>";
+
+  var MODALS =
+    modal("exampleModal", "New message",
+      '<label>Contact Email:</label><input type="text" id="recipient-email">' +
+      '<label>Contact Name:</label><input type="text" id="recipient-name">' +
+      '<label>Message:</label><textarea id="message-text"></textarea>',
+      '<button type="button" class="btn btn-primary" data-action="contact">Send message</button>') +
+    modal("signInModal", "Sign up",
+      '<label>Username:</label><input type="text" id="sign-username">' +
+      '<label>Password:</label><input type="password" id="sign-password">',
+      '<button type="button" class="btn btn-primary" data-action="signup">Sign up</button>') +
+    modal("logInModal", "Log in",
+      '<label>Username:</label><input type="text" id="loginusername">' +
+      '<label>Password:</label><input type="password" id="loginpassword">',
+      '<button type="button" class="btn btn-primary" data-action="login">Log in</button>') +
+    modal("videoModal", "About us",
+      '<video id="example-video" width="400" height="220" controls preload="auto" src="media/about.mp4"></video>',
+      "");
+
+  function modal(id, title, body, footer) {
+    return (
+      '<div class="modal" id="' + id + '" role="dialog">' +
+      '<div class="modal-dialog"><div class="modal-content">' +
+      '<div class="modal-header"><h5 class="modal-title">' + title + "</h5>" +
+      '<button type="button" class="close" aria-label="Close">&times;</button></div>' +
+      '<div class="modal-body">' + body + "</div>" +
+      '<div class="modal-footer"><button type="button" class="btn btn-secondary">Close</button>' + footer + "</div>" +
+      "</div></div></div>"
+    );
+  }
+
+  // ---------- helpers ----------
+  function $(sel) { return document.querySelector(sel); }
+
+  function api(path, payload) {
+    return fetch(API + "/" + path, {
+      method: payload === undefined ? "GET" : "POST",
+      headers: { "Content-Type": "application/json" },
+      body: payload === undefined ? undefined : JSON.stringify(payload),
+    }).then(function (r) { return r.text(); }).then(function (t) { return t ? JSON.parse(t) : ""; });
+  }
+
+  function getCookie(name) {
+    var m = document.cookie.match(new RegExp("(?:^|; )" + name + "=([^;]*)"));
+    return m ? decodeURIComponent(m[1]) : "";
+  }
+
+  function setCookie(name, value) {
+    document.cookie = name + "=" + encodeURIComponent(value) + "; path=/";
+  }
+
+  function cartOwner() {
+    var token = getCookie("tokenp_");
+    if (token) return token;
+    var guest = getCookie("user");
+    if (!guest) {
+      guest = "guest-" + Math.random().toString(16).slice(2);
+      setCookie("user", guest);
+    }
+    return guest;
+  }
+
+  function showModal(id) {
+    var el = document.getElementById(id);
+    el.style.display = "block";
+    el.classList.add("show");
+  }
+
+  function hideModal(el) {
+    el.classList.remove("show");
+    el.style.display = "none";
+  }
+
+  function uuid() {
+    return "xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx".replace(/[xy]/g, function (c) {
+      var r = (Math.random() * 16) | 0;
+      return (c === "x" ? r : (r & 0x3) | 0x8).toString(16);
+    });
+  }
+
+  // ---------- header / auth ----------
+  function wireHeader() {
+    document.body.insertAdjacentHTML("afterbegin", HEADER);
+    document.body.insertAdjacentHTML("beforeend", MODALS);
+
+    document.querySelectorAll("[data-target]").forEach(function (link) {
+      link.addEventListener("click", function (e) {
+        e.preventDefault();
+        showModal(link.getAttribute("data-target").slice(1));
+      });
+    });
+    document.querySelectorAll(".modal .close, .modal .btn-secondary").forEach(function (btn) {
+      btn.addEventListener("click", function () { hideModal(btn.closest(".modal")); });
+    });
+    document.querySelectorAll("[data-action]").forEach(function (btn) {
+      btn.addEventListener("click", ACTIONS[btn.getAttribute("data-action")]);
+    });
+    $("#logout2").addEventListener("click", function (e) {
+      e.preventDefault();
+      document.cookie = "tokenp_=; expires=Thu, 01 Jan 1970 00:00:00 GMT; path=/";
+      window.location.href = "index.html";
+    });
+
+    var token = getCookie("tokenp_");
+    if (token) {
+      api("check", { token: token }).then(function (res) {
+        if (res && res.Item) {
+          $("#nameofuser").textContent = "Welcome " + res.Item.username;
+          $("#nameofuser").style.display = "block";
+          $("#logout2").style.display = "block";
+          $("#login2").style.display = "none";
+          $("#signin2").style.display = "none";
+        }
+      });
+    }
+  }
+
+  var ACTIONS = {
+    contact: function () {
+      alert("Thanks for the message!!");
+      hideModal($("#exampleModal"));
+    },
+    signup: function () {
+      api("signup", { username: $("#sign-username").value, password: btoa($("#sign-password").value) })
+        .then(function (res) {
+          if (res && res.errorMessage) {
+            alert(res.errorMessage);
+          } else {
+            alert("Sign up successful.");
+            hideModal($("#signInModal"));
+          }
+        });
+    },
+    login: function () {
+      var username = $("#loginusername").value;
+      api("login", { username: username, password: btoa($("#loginpassword").value) })
+        .then(function (res) {
+          if (res && res.errorMessage) {
+            alert(res.errorMessage);
+          } else {
+            setCookie("tokenp_", String(res).split("Auth_token: ")[1]);
+            window.location.href = "index.html";
+          }
+        });
+    },
+  };
+
+  // ---------- index ----------
+  function renderCards(items) {
+    $("#tbodyid").innerHTML = items.map(function (p) {
+      return (
+        '<div class="col-lg-4 col-md-6 mb-4"><div class="card h-100">' +
+        '<a href="prod.html?idp_=' + p.id + '"><img class="card-img-top img-fluid" src="imgs/' + p.id + '.svg" alt=""></a>' +
+        '<div class="card-block"><h4 class="card-title"><a href="prod.html?idp_=' + p.id + '" class="hrefch">' + p.title + "</a></h4>" +
+        "<h5>$" + p.price + '</h5><p id="article" class="card-text">' + p.desc + "</p></div>" +
+        "</div></div>"
+      );
+    }).join("");
+  }
+
+  function initIndex() {
+    var lastKey = null;
+    api("entries").then(function (res) {
+      renderCards(res.Items);
+      lastKey = res.LastEvaluatedKey ? res.LastEvaluatedKey.id : null;
+    });
+    document.querySelectorAll("[data-cat]").forEach(function (link) {
+      link.addEventListener("click", function (e) {
+        e.preventDefault();
+        api("bycat", { cat: link.getAttribute("data-cat") }).then(function (res) { renderCards(res.Items); });
+      });
+    });
+    $("#next2").addEventListener("click", function () {
+      api("pagination", { id: String(lastKey || PAGE_SIZE) }).then(function (res) {
+        renderCards(res.Items);
+      });
+    });
+    $("#prev2").addEventListener("click", function () {
+      api("entries").then(function (res) { renderCards(res.Items); });
+    });
+  }
+
+  // ---------- product ----------
+  function initProduct() {
+    var id = new URLSearchParams(window.location.search).get("idp_");
+    api("view", { id: id }).then(function (p) {
+      $(".name").textContent = p.title;
+      $(".price-container").innerHTML = "$" + p.price + " <small>*includes tax</small>";
+      $("#more-information p").textContent = p.desc;
+      $(".item img").setAttribute("src", "imgs/" + p.id + ".svg");
+    });
+    $("#add-to-cart").addEventListener("click", function (e) {
+      e.preventDefault();
+      api("addtocart", { id: uuid(), cookie: cartOwner(), prod_id: Number(id), flag: true }).then(function () {
+        alert("Product added");
+      });
+    });
+  }
+
+  // ---------- cart ----------
+  function loadCart() {
+    api("viewcart", { cookie: cartOwner(), flag: true }).then(function (res) {
+      var items = res.Items || [];
+      return Promise.all(items.map(function (item) {
+        return api("view", { id: String(item.prod_id) }).then(function (p) { return { item: item, product: p }; });
+      }));
+    }).then(function (rows) {
+      var total = 0;
+      $("#tbodyid").innerHTML = rows.map(function (r) {
+        total += r.product.price;
+        return (
+          '<tr class="success"><td><img width="100" height="100" src="imgs/' + r.product.id + '.svg"></td>' +
+          "<td>" + r.product.title + "</td><td>" + r.product.price + "</td>" +
+          '<td><a href="#" data-item="' + r.item.id + '">Delete</a></td></tr>'
+        );
+      }).join("");
+      $("#totalp").textContent = rows.length ? String(total) : "";
+      document.querySelectorAll("[data-item]").forEach(function (link) {
+        link.addEventListener("click", function (e) {
+          e.preventDefault();
+          api("deleteitem", { id: link.getAttribute("data-item") }).then(loadCart);
+        });
+      });
+    });
+  }
+
+  function initCart() {
+    document.body.insertAdjacentHTML("beforeend", modal("orderModal", "Place order",
+      ["name", "country", "city", "card", "month", "year"].map(function (f) {
+        return "<label>" + f + ':</label><input type="text" id="' + f + '">';
+      }).join(""),
+      '<button type="button" class="btn btn-primary" data-action="purchase">Purchase</button>'));
+    var order = $("#orderModal");
+    order.querySelectorAll(".close, .btn-secondary").forEach(function (btn) {
+      btn.addEventListener("click", function () { hideModal(order); });
+    });
+    $("#place-order").addEventListener("click", function () { showModal("orderModal"); });
+    order.querySelector("[data-action=purchase]").addEventListener("click", function () {
+      if (!$("#name").value || !$("#card").value) {
+        alert("Please fill out Name and Creditcard.");
+        return;
+      }
+      hideModal(order);
+      var sweet = $(".sweet-alert");
+      sweet.querySelector("p").innerHTML =
+        "Id: " + Math.floor(Math.random() * 9000000) + "<br>Amount: " + ($("#totalp").textContent || "0") + " USD" +
+        "<br>Card Number: " + $("#card").value + "<br>Name: " + $("#name").value;
+      sweet.classList.add("showSweetAlert", "visible");
+      sweet.style.display = "block";
+    });
+    $(".sweet-alert button.confirm").addEventListener("click", function () {
+      api("deletecart", { cookie: cartOwner() }).then(function () { window.location.href = "index.html"; });
+    });
+    loadCart();
+  }
+
+  document.addEventListener("DOMContentLoaded", function () {
+    wireHeader();
+    var page = document.body.getAttribute("data-page");
+    if (page === "index") initIndex();
+    if (page === "product") initProduct();
+    if (page === "cart") initCart();
+  });
+})();
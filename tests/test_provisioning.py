@@ -0,0 +1,26 @@
+"""
+User pool bookkeeping (no browser, no network).
+Run: pytest -q tests/test_provisioning.py
+"""
+
+from . import utils
+from .provisioning import UserPool
+
+LIVE_API = "https://api.demoblaze.com"
+STAND_IN_API = "http://127.0.0.1:8901/api"
+
+
+def test_pool_keeps_users_of_other_deployments(tmp_path, monkeypatch):
+    pool = UserPool(tmp_path / "pool.json")
+    monkeypatch.setattr(utils, "API_URL", LIVE_API)
+    pool.add("live_user", "pw")
+
+    monkeypatch.setattr(utils, "API_URL", STAND_IN_API)
+    assert pool.lease("stand-in run") is None  # the live user is not leased here...
+    pool.add("local_user", "pw")
+    assert pool.lease("stand-in run")["username"] == "local_user"
+    assert pool.free_count() == 0
+
+    monkeypatch.setattr(utils, "API_URL", LIVE_API)
+    assert pool.free_count() == 1  # ...nor dropped from the file
+    assert pool.lease("live run")["username"] == "live_user"
@@ -3,6 +3,8 @@ Regression-style coverage (multiple smaller UI checks).
 Run: pytest -q tests/test_regression.py
 """
 
+import asyncio
+
 import pytest
 import allure
 from selenium.common.exceptions import TimeoutException
@@ -10,22 +12,26 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+from .backends import CdpBrowser
+from .pages.home_page import AsyncHomePage
+from .pages.product_page import ProductPage
+from .catalog import get_catalog
+from .provisioning import ProvisioningError, seed_cart
 from .utils import (
-    add_first_product_to_cart,
-    add_product_by_index,
     cart_rows,
     close_visible_modal,
     delete_first_cart_row,
+    fill_form,
     go_to_cart,
-    login,
     open_about_modal,
     open_category,
     open_contact_modal,
     open_home,
+    product_cards,
     submit_contact_form,
     take_screenshot,
+    wait_alert_text_and_accept,
     wait_click,
-    wait_fill,
     wait_for_success_modal,
 )
 
@@ -62,23 +68,15 @@ def test_about_modal(driver):
 
 @pytest.mark.regression
 @allure.title("Sign-up existing user shows error alert")
-def wait_for_alert(driver, timeout=10):
-    WebDriverWait(driver, timeout).until(EC.alert_is_present())
-    alert = driver.switch_to.alert
-    text = alert.text
-    alert.accept()
-    return text
-
-
-# Reuse wait_for_alert for sign-up test
-@pytest.mark.regression
-def test_signup_existing_user(fresh_user, driver):  # noqa: F811
+def test_signup_existing_user(fresh_user, driver):
     open_home(driver)
     wait_click(driver, (By.ID, "signin2"))
-    wait_fill(driver, (By.ID, "sign-username"), fresh_user["username"])
-    wait_fill(driver, (By.ID, "sign-password"), fresh_user["password"])
+    fill_form(
+        driver,
+        {(By.ID, "sign-username"): fresh_user["username"], (By.ID, "sign-password"): fresh_user["password"]},
+    )
     wait_click(driver, (By.XPATH, "//div[@id='signInModal']//button[text()='Sign up']"))
-    alert_text = wait_for_alert(driver)
+    alert_text = wait_alert_text_and_accept(driver)
     assert "exist" in alert_text.lower()
 
 
@@ -87,18 +85,15 @@ def test_signup_existing_user(fresh_user, driver):  # noqa: F811
 def test_login_wrong_password(fresh_user, driver):
     open_home(driver)
     wait_click(driver, (By.ID, "login2"))
-    wait_fill(driver, (By.ID, "loginusername"), fresh_user["username"])
-    wait_fill(driver, (By.ID, "loginpassword"), "WrongPass!")
+    fill_form(driver, {(By.ID, "loginusername"): fresh_user["username"], (By.ID, "loginpassword"): "WrongPass!"})
     wait_click(driver, (By.XPATH, "//div[@id='logInModal']//button[text()='Log in']"))
-    alert_text = wait_for_alert(driver)
+    alert_text = wait_alert_text_and_accept(driver)
     assert "wrong" in alert_text.lower()
 
 
 @pytest.mark.regression
 @allure.title("Logout restores login buttons and hides welcome banner")
-def test_logout_visibility(fresh_user, driver):
-    open_home(driver)
-    login(driver, fresh_user["username"], fresh_user["password"])
+def test_logout_visibility(logged_in_user, driver):
     wait_click(driver, (By.ID, "logout2"))
     WebDriverWait(driver, 5).until(EC.visibility_of_element_located((By.ID, "login2")))
     WebDriverWait(driver, 5).until(EC.invisibility_of_element_located((By.ID, "nameofuser")))
@@ -107,13 +102,54 @@ def test_logout_visibility(fresh_user, driver):
 @pytest.mark.regression
 @allure.title("Category filters change product lists")
 @pytest.mark.parametrize("category", ["Phones", "Laptops", "Monitors"])
+@pytest.mark.command_budget(15)
 def test_category_filtering(category, driver):
     open_home(driver)
     open_category(driver, category)
-    cards = WebDriverWait(driver, 5).until(
-        EC.presence_of_all_elements_located((By.CSS_SELECTOR, "#tbodyid .card-title"))
-    )
+    cards = product_cards(driver)
     assert len(cards) > 0
+    assert all(card["title"] for card in cards)
+    try:
+        expected = get_catalog().in_category(category)
+    except ProvisioningError:
+        return  # API unreachable: nothing to compare against, the UI checks above still ran
+    assert [card["title"] for card in cards] == [p["title"] for p in expected]
+    assert [card["price"] for card in cards] == [p["price"] for p in expected]
+
+
+@pytest.mark.regression
+@allure.title("Product page opened by id matches the catalog")
+def test_product_page_matches_catalog(driver, catalog):
+    product = catalog.in_category("Laptops")[0]
+    page = ProductPage(driver).open(product["id"])
+    assert page.name() == product["title"]
+    assert page.price() == product["price"]
+
+
+@pytest.mark.regression
+@allure.title("Async backend runs one guest journey per category concurrently")
+def test_async_sessions_in_parallel(catalog):
+    pytest.importorskip("websockets")
+    categories = ["Phones", "Laptops", "Monitors"]
+
+    async def journey(browser, category):
+        home = await AsyncHomePage(await browser.new_session()).open()
+        await home.browse_category(category)
+        cards = await home.cards()
+        alert_text = await home.add_product_in_category(category)
+        cart = await home.go_to_cart()
+        return cards, alert_text, await cart.rows()
+
+    async def run():
+        async with await CdpBrowser.launch() as browser:
+            return await asyncio.gather(*(journey(browser, category) for category in categories))
+
+    for category, (cards, alert_text, rows) in zip(categories, asyncio.run(run())):
+        expected = catalog.in_category(category)
+        assert [card["title"] for card in cards] == [p["title"] for p in expected]
+        assert "added" in alert_text.lower()
+        # separate browser contexts: each cart holds only its own product
+        assert [(r["title"], r["price"]) for r in rows] == [(expected[0]["title"], expected[0]["price"])]
 
 
 @pytest.mark.regression
@@ -140,22 +176,17 @@ def test_pagination_next_prev(driver):
 
 @pytest.mark.regression
 @allure.title("Add multiple items and remove one updates cart total")
-def test_add_multiple_and_remove(fresh_user, driver):
-    open_home(driver)
-    login(driver, fresh_user["username"], fresh_user["password"])
-    add_product_by_index(driver, 0)
-    driver.back()
-    open_home(driver)
-    add_product_by_index(driver, 1)
-    driver.back()
-
+def test_add_multiple_and_remove(logged_in_user, driver, catalog):
+    products = catalog.in_category("Phones")[:2]
+    seed_cart(driver, [p["id"] for p in products], clear=True)
     go_to_cart(driver)
-    items = cart_rows(driver)
-    assert len(items) >= 2
+    items = cart_rows(driver, count=2)
+    assert sorted(item["title"] for item in items) == sorted(p["title"] for p in products)
+    assert all(item["price"] == catalog.price(item["title"]) for item in items)
 
     total_before = driver.find_element(By.ID, "totalp").text
-    delete_first_cart_row(driver)
-    WebDriverWait(driver, 5).until(lambda d: len(cart_rows(d)) == len(items) - 1)
+    delete_first_cart_row(driver)  # waits for the deleted row to go away
+    assert len(cart_rows(driver)) == len(items) - 1
     total_after = driver.find_element(By.ID, "totalp").text
     assert int(total_after) < int(total_before)
 
@@ -163,10 +194,8 @@ def test_add_multiple_and_remove(fresh_user, driver):
 @pytest.mark.regression
 @allure.title("Place Order requires fields (expected fail tolerated)")
 @pytest.mark.xfail(reason="Site often allows blank purchase", strict=False)
-def test_place_order_requires_fields(fresh_user, driver):
-    open_home(driver)
-    login(driver, fresh_user["username"], fresh_user["password"])
-    add_first_product_to_cart(driver)
+def test_place_order_requires_fields(logged_in_user, driver):
+    seed_cart(driver, [1], clear=True)
     go_to_cart(driver)
     wait_click(driver, (By.XPATH, "//button[text()='Place Order']"))
     wait_click(driver, (By.XPATH, "//button[text()='Purchase']"))
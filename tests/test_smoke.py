@@ -11,6 +11,10 @@ What it does (one continuous session, one browser):
 7) Checkout and verify success
 8) Logout
 
+Each step is a stage of a StagedFlow (tests/stages.py): a failing step is
+retried from the state the previous step left behind, and a rerun after a
+failure resumes from the last completed step (FLOW_RESUME=0 to start over).
+
 How to run:
     pytest -q tests/test_smoke.py
 """
@@ -20,8 +24,11 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+from tests.catalog import get_catalog
 from tests.pages.home_page import HomePage
 from tests.pages.cart_page import CartPage
+from tests.provisioning import ProvisioningError, cart_items, clear_cart, seed_cart, session_token
+from tests.stages import StagedFlow
 from tests.utils import generate_username, take_screenshot, wait_click
 
 
@@ -47,69 +54,132 @@ def wait_for_total(driver, timeout=5):
 
 
 @allure.title("All-in-one single session flow")
-def test_single_session_full_flow(session_driver):
-    # Use one browser for the whole flow
-    d = session_driver
-    home = HomePage(d).open()
+def test_single_session_full_flow(session_driver, request):
+    # Use one browser for the whole flow; each step is a checkpointed stage
+    # (see tests/stages.py), so a flaky step is retried from the last good
+    # state and a rerun resumes where the previous run stopped.
+    flow = StagedFlow(session_driver, "single_session_full_flow", node=request.node)
+
+    # The cart lives on the server: after a restore, make it match the checkpoint
+    @flow.on_restore
+    def restore_cart(ctx):
+        if "cart_ids" not in ctx.state:
+            return
+        try:
+            seed_cart(ctx.driver, ctx["cart_ids"], clear=True)
+        except ProvisioningError as exc:
+            allure.attach(
+                f"cart not re-seeded after restore (API unreachable): {exc}",
+                name="restore_cart skipped",
+                attachment_type=allure.attachment_type.TEXT,
+            )
+
+    def cart_state(d, at_least):
+        """Cart contents from the API; without it, rows counted on the cart page (no ids to re-seed)."""
+        try:
+            ids = [item["prod_id"] for item in cart_items(session_token(d))]
+        except ProvisioningError:
+            cart = HomePage(d).go_to_cart()
+            WebDriverWait(d, 5).until(lambda drv: len(cart.rows()) >= at_least)  # rows render one by one
+            return {"products_added": len(cart.rows())}
+        return {"cart_ids": ids, "products_added": len(ids)}
 
     # --- Step 1: Register a new user ---
-    username = generate_username()
-    password = "Password123!"
-    reg_alert = home.register(username, password)
-    assert "sign up" in reg_alert.lower() or "successful" in reg_alert.lower()
+    @flow.stage("register", produces=("username", "password"))
+    def register(ctx):
+        home = HomePage(ctx.driver).open()
+        username = generate_username()
+        password = "Password123!"
+        reg_alert = home.register(username, password)
+        assert "sign up" in reg_alert.lower() or "successful" in reg_alert.lower()
+        return {"username": username, "password": password}
 
     # --- Step 2: Login ---
-    home.login(username, password)
+    @flow.stage("login", produces=("logged_in_as",))
+    def login(ctx):
+        HomePage(ctx.driver).open().login(ctx["username"], ctx["password"])
+        return {"logged_in_as": ctx["username"]}
 
     # --- Step 3: Send Contact message ---
-    contact_alert = home.send_contact(CONTACT_EMAIL, CONTACT_NAME, CONTACT_MESSAGE)
-    assert "thanks" in contact_alert.lower()
+    @flow.stage("contact")
+    def contact(ctx):
+        contact_alert = HomePage(ctx.driver).send_contact(CONTACT_EMAIL, CONTACT_NAME, CONTACT_MESSAGE)
+        assert "thanks" in contact_alert.lower()
 
     # --- Step 4: About modal ---
-    home.open_and_close_about()
+    @flow.stage("about")
+    def about(ctx):
+        HomePage(ctx.driver).open_and_close_about()
 
     # --- Step 5: Browse categories and paginate ---
-    for cat in ["Phones", "Laptops", "Monitors"]:
-        home.browse_category(cat)
+    @flow.stage("browse")
+    def browse(ctx):
+        home = HomePage(ctx.driver)
+        for cat in ["Phones", "Laptops", "Monitors"]:
+            home.browse_category(cat)
 
-    # Pagination: ensure next page shows a different first product
-    first_name = home.first_card_name()
-    home.next_page_until_changed(first_name)
+        # Pagination: ensure next page shows a different first product
+        first_name = home.first_card_name()
+        home.next_page_until_changed(first_name)
 
     # --- Step 6: Add two products (different categories to avoid duplicates) ---
-    home.add_product_in_category("Phones", 0)
-    d.back()
-    home.open()
-    # try laptop, fall back to another phone if needed
-    try:
-        home.add_product_in_category("Laptops", 0)
-    except Exception:
-        home.add_product_in_category("Phones", 1)
-    d.back()
+    @flow.stage("add_products", produces=("products_added",))
+    def add_products(ctx):
+        d = ctx.driver
+        try:
+            clear_cart(session_token(d))  # a retry or resumed run starts from an empty cart
+        except ProvisioningError:
+            pass  # no API: the freshly registered user's cart starts empty anyway
+        home = HomePage(d)
+        home.add_product_in_category("Phones", 0)
+        # try laptop, fall back to another phone if needed
+        try:
+            home.add_product_in_category("Laptops", 0)
+        except Exception:
+            home.add_product_in_category("Phones", 1)
+        return cart_state(d, at_least=2)  # what really landed in the cart
 
     # --- Step 7: Cart check and remove one item ---
-    cart = home.go_to_cart()
-    items = cart.rows()
-    if len(items) < 2:
-        # Add one more item to satisfy expectation
-        d.back()
-        home.open()
-        home.add_product_in_category("Phones", 2)
-        d.back()
-        cart = home.go_to_cart()
+    @flow.stage("cart", produces=("cart_total",))
+    def cart_edit(ctx):
+        d = ctx.driver
+        expected = ctx["products_added"]
+        if expected < 2:
+            # Top the cart up through the backend instead of browsing again
+            try:
+                monitors = get_catalog().in_category("Monitors")[: 2 - expected]
+                seed_cart(d, [p["id"] for p in monitors])
+            except ProvisioningError:
+                for index in range(2 - expected):
+                    HomePage(d).add_product_in_category("Monitors", index)
+            expected = 2
+        cart = HomePage(d).go_to_cart()
+        WebDriverWait(d, 5).until(lambda drv: len(cart.rows()) == expected)  # rows render one by one
         items = cart.rows()
-    assert len(items) >= 2
-    total_before = cart.total()
-    cart.delete_first_row()
-    total_after = cart.total()
-    assert total_after < total_before
+        assert len(items) == expected
+        total_before = cart.total()
+        cart.delete_first_row()
+        total_after = cart.total()
+        assert total_after < total_before
+        return dict(cart_state(d, at_least=expected - 1), cart_total=total_after)
 
     # --- Step 8: Checkout and verify success ---
-    success_modal = cart.checkout(ORDER_NAME, ORDER_COUNTRY, ORDER_CITY, CARD_NUMBER, CARD_MONTH, CARD_YEAR)
-    take_screenshot(d, "single_full_after_purchase")
-    assert "Thank you for your purchase" in success_modal.find_element(By.TAG_NAME, "h2").text
-    success_modal.find_element(By.CSS_SELECTOR, "button.confirm").click()
+    @flow.stage("checkout")
+    def checkout(ctx):
+        d = ctx.driver
+        cart = CartPage(d)  # the cart stage (or its checkpoint) leaves us on the cart page
+        cart.rows()
+        success_modal = cart.checkout(ORDER_NAME, ORDER_COUNTRY, ORDER_CITY, CARD_NUMBER, CARD_MONTH, CARD_YEAR)
+        take_screenshot(d, "single_full_after_purchase")
+        assert "Thank you for your purchase" in success_modal.find_element(By.TAG_NAME, "h2").text
+        success_modal.find_element(By.CSS_SELECTOR, "button.confirm").click()
+        return {"cart_ids": []}
 
     # --- Step 9: Logout ---
-    wait_click(d, (By.ID, "logout2"))
-    WebDriverWait(d, 5).until(EC.visibility_of_element_located((By.ID, "login2")))
+    @flow.stage("logout")
+    def logout(ctx):
+        d = ctx.driver
+        wait_click(d, (By.ID, "logout2"))
+        WebDriverWait(d, 5).until(EC.visibility_of_element_located((By.ID, "login2")))
+
+    flow.run()
@@ -0,0 +1,152 @@
+"""
+Adaptive wait timeouts calibrated from observed latencies.
+
+Every wait in tests/waits.py asks `SERVICE.timeout_for(key, requested)` for
+its budget and reports how long it actually took. Latencies of successful
+waits are kept per site (host of BASE_URL, so stand-in runs never calibrate
+live-site waits) and action key (e.g. "visible ('id', 'login2')") in
+`.wait_latencies.json` across runs. Once a key has enough samples its
+timeout becomes
+
+    percentile(latencies, TIMEOUT_PERCENTILE) * (1 + TIMEOUT_MARGIN) + TIMEOUT_MARGIN_S
+
+clamped to [TIMEOUT_FLOOR_S, TIMEOUT_CEILING_S]. Real failures surface
+after a few seconds instead of the old flat 10s, and a slow host, whose own
+history is slower, gets proportionally more headroom. Only waits called
+without a timeout are calibrated: an explicit timeout is used as given (a
+short "should not appear" wait stays short, a long one is not capped), and
+keys without enough history use DEFAULT_TIMEOUT.
+
+Knobs (environment variables):
+- ADAPTIVE_TIMEOUTS      1 (default) | 0 = always use DEFAULT_TIMEOUT when none is given
+- TIMEOUT_PERCENTILE     default 99
+- TIMEOUT_MARGIN         relative headroom on top of the percentile (default 0.5)
+- TIMEOUT_MARGIN_S       absolute headroom in seconds (default 1.0)
+- TIMEOUT_FLOOR_S        never wait less than this (default 2)
+- TIMEOUT_CEILING_S      never wait more than this (default 30)
+- TIMEOUT_MIN_SAMPLES    samples needed before a key is calibrated (default 5)
+"""
+
+import fcntl
+import json
+import os
+import threading
+from pathlib import Path
+from urllib.parse import urlparse
+
+from .instrumentation import percentile
+
+
+ROOT = Path(__file__).resolve().parent.parent
+STORE_FILE = ROOT / ".wait_latencies.json"
+DEFAULT_TIMEOUT = 10.0
+KEEP_SAMPLES = 50
+
+
+def _site() -> str:
+    from . import utils  # imported late: utils -> waits -> timeouts
+
+    return urlparse(utils.BASE_URL).netloc
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class TimeoutService:
+    """Per-key latency history and the timeouts derived from it."""
+
+    def __init__(self, path: Path = STORE_FILE):
+        self.path = path
+        self.enabled = os.getenv("ADAPTIVE_TIMEOUTS", "1") != "0"
+        self.pct = _env_float("TIMEOUT_PERCENTILE", 99)
+        self.margin = _env_float("TIMEOUT_MARGIN", 0.5)
+        self.margin_s = _env_float("TIMEOUT_MARGIN_S", 1.0)
+        self.floor = _env_float("TIMEOUT_FLOOR_S", 2.0)
+        self.ceiling = _env_float("TIMEOUT_CEILING_S", 30.0)
+        self.min_samples = int(_env_float("TIMEOUT_MIN_SAMPLES", 5))
+        self._lock = threading.Lock()
+        self._history = None  # site -> key -> [seconds, ...] from earlier runs (loaded lazily)
+        self._new = {}  # site -> key -> [seconds, ...] observed in this process
+        # stats for the run summary
+        self.adapted = 0
+        self.defaulted = 0
+        self.explicit = 0
+        self.timed_out = 0
+
+    def _read(self) -> dict:
+        try:
+            stored = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        # files from before per-site keys held {key: [...]}: not usable, drop them
+        return {site: keys for site, keys in stored.items() if isinstance(keys, dict)}
+
+    def _samples(self, site, key):
+        if self._history is None:
+            self._history = self._read()
+        return self._history.get(site, {}).get(key, []) + self._new.get(site, {}).get(key, [])
+
+    def calibrated(self, key):
+        """Timeout derived from history for `key`, or None if not enough samples."""
+        if not key:
+            return None
+        site = _site()
+        with self._lock:
+            samples = self._samples(site, key)
+        if len(samples) < self.min_samples:
+            return None
+        budget = percentile(samples, self.pct) * (1 + self.margin) + self.margin_s
+        return min(max(budget, self.floor), self.ceiling)
+
+    def timeout_for(self, key, requested=None) -> float:
+        """Budget for one wait on `key`: `requested` as given, else calibrated (or DEFAULT_TIMEOUT)."""
+        if requested is not None:
+            with self._lock:
+                self.explicit += 1
+            return requested
+        budget = self.calibrated(key) if self.enabled else None
+        with self._lock:
+            if budget is None:
+                self.defaulted += 1
+                return DEFAULT_TIMEOUT
+            self.adapted += 1
+        return budget
+
+    def record(self, key, seconds: float, ok: bool = True):
+        """Report a finished wait. Timeouts are counted, not used as samples."""
+        with self._lock:
+            if not ok:
+                self.timed_out += 1
+            elif key:
+                self._new.setdefault(_site(), {}).setdefault(key, []).append(round(seconds, 3))
+
+    def save(self):
+        """Merge this process's samples into the store (safe across xdist workers)."""
+        with self._lock:
+            new, self._new = self._new, {}
+        if not new:
+            return
+        with open(self.path.with_suffix(".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            stored = self._read()
+            for site, keys in new.items():
+                known = stored.setdefault(site, {})
+                for key, samples in keys.items():
+                    known[key] = (known.get(key, []) + samples)[-KEEP_SAMPLES:]
+            self.path.write_text(json.dumps(stored, indent=1))
+            fcntl.flock(lock, fcntl.LOCK_UN)
+        with self._lock:
+            self._history = stored
+
+    def summary(self) -> str:
+        return (
+            f"timeouts: {self.adapted} waits used calibrated timeouts, {self.defaulted} the default, "
+            f"{self.explicit} the caller's, {self.timed_out} timed out"
+        )
+
+
+SERVICE = TimeoutService()
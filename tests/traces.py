@@ -0,0 +1,133 @@
+"""
+Compact per-test WebDriver command traces.
+
+Opt-in with COMMAND_TRACE=1, like ACTION_TIMING. While a test body runs,
+the profiler (tests/profiler.py) keeps one small tuple per command: no
+formatting, no I/O. When the test ends its trace is appended as one JSON
+line to `reports/traces/<run>/<worker>.jsonl`:
+
+    {"test": "<nodeid>", "outcome": "passed",
+     "commands": [[command, locator, helper, start_ms, ms, size], ...]}
+
+- locator  what the command targeted: the find strategy and value, or the
+           first argument of a script call (locator or CSS) - "" if none
+- helper   the tests/ function that issued it (see profiler.calling_helper)
+- start_ms offset from the start of the test body; ms is the duration
+- size     length of the result (characters, list items or dict keys)
+
+Only the test body is traced (the pytest_runtest_call phase). Commands sent
+by fixtures during setup and teardown - the `logged_in_user` fast-login
+cookie injection, alert/network hooks, the pool's reset between tests - are
+not recorded, so a diff shows only what the test itself does.
+
+Compare two runs with `python -m benchmarks.trace_diff` (the two latest by
+default).
+
+Knobs (environment variables):
+- COMMAND_TRACE       1 = record traces | unset/0 (default) = do not
+- COMMAND_TRACE_RUN   run name (default: the start time, shared with xdist workers)
+- COMMAND_TRACE_KEEP  newest runs kept under reports/traces (default 10)
+"""
+
+import json
+import os
+import shutil
+import time
+
+from .parallel import REPORT_DIR, worker_id
+
+
+TRACE_DIR = REPORT_DIR / "traces"
+FIELDS = ("command", "locator", "helper", "start_ms", "ms", "size")
+
+
+def enabled() -> bool:
+    return os.getenv("COMMAND_TRACE") == "1"
+
+
+def start_run() -> str:
+    """Name this run's trace dir once; xdist workers inherit it through the environment."""
+    name = os.getenv("COMMAND_TRACE_RUN")
+    if name:
+        return name
+    name = time.strftime("%Y%m%d-%H%M%S")
+    os.environ["COMMAND_TRACE_RUN"] = name
+    _prune(int(os.getenv("COMMAND_TRACE_KEEP", "10")) - 1)
+    return name
+
+
+def _prune(keep: int):
+    stale = runs()[:-keep] if keep > 0 else runs()
+    for path in stale:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def runs():
+    """Recorded run dirs, oldest first."""
+    if not TRACE_DIR.is_dir():
+        return []
+    return sorted((p for p in TRACE_DIR.iterdir() if p.is_dir()), key=lambda p: p.stat().st_mtime)
+
+
+STRATEGIES = {"id", "xpath", "link text", "partial link text", "name", "tag name", "class name", "css selector"}
+
+
+def _describe(arg) -> str:
+    if isinstance(arg, str):
+        return arg if len(arg) < 200 else ""
+    if isinstance(arg, list):
+        if len(arg) >= 2 and isinstance(arg[0], str) and arg[0] in STRATEGIES and isinstance(arg[1], str):
+            return f"{arg[0]}={arg[1]}"  # a locator (typed values after it are left out)
+        return ",".join(filter(None, (_describe(item) for item in arg)))
+    return ""
+
+
+def locator(params) -> str:
+    """Short description of a command's target: find strategy=value, script locator/CSS, URL or CDP method."""
+    if not params:
+        return ""
+    if "using" in params:
+        return f"{params['using']}={params['value']}"
+    if params.get("args"):
+        return _describe(params["args"][0])
+    return params.get("url") or params.get("cmd") or ""
+
+
+def result_size(response) -> int:
+    value = response.get("value") if isinstance(response, dict) else response
+    if value is None:
+        return 0
+    if isinstance(value, (str, list, tuple, dict)):
+        return len(value)
+    return 1
+
+
+def write(nodeid: str, profile, outcome: str):
+    """Append the trace `profile` recorded for `nodeid` to this worker's file (and stop tracing)."""
+    if profile.trace is None:
+        return None
+    trace, profile.trace = profile.trace, None
+    commands = [
+        [command, locator(params), helper, round(started * 1000, 1), round(seconds * 1000, 1), size]
+        for command, params, helper, started, seconds, size in trace
+    ]
+    directory = TRACE_DIR / start_run()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{worker_id()}.jsonl"
+    line = json.dumps({"test": nodeid, "outcome": outcome, "commands": commands}, separators=(",", ":"))
+    with open(path, "a") as out:
+        out.write(line + "\n")
+    return path
+
+
+def load(directory) -> dict:
+    """{nodeid: [{command, locator, helper, start_ms, ms, size}, ...]} for one run (last trace wins)."""
+    tests = {}
+    for path in sorted(directory.glob("*.jsonl")):
+        with open(path) as lines:
+            for line in lines:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                tests[entry["test"]] = [dict(zip(FIELDS, record)) for record in entry["commands"]]
+    return tests
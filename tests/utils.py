@@ -3,210 +3,340 @@ Shared helpers for Demoblaze Selenium tests.
 """
 
 import os
+import time
 import uuid
 from pathlib import Path
+from urllib.parse import urlparse
 
-import allure
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
+
+from . import locators as L
+from . import alerts, artifacts, driver_profiles, network, profile_templates, scripts, waits
+from .instrumentation import timed
 
 
 ROOT = Path(__file__).resolve().parent.parent
-BASE_URL = "https://www.demoblaze.com"
+# Point these at another deployment (or the local stand-in, see conftest) via env.
+BASE_URL = os.getenv("DEMOBLAZE_BASE_URL", "https://www.demoblaze.com").rstrip("/")
+API_URL = os.getenv("DEMOBLAZE_API_URL", "https://api.demoblaze.com").rstrip("/")
+
+
+def use_site(base_url: str, api_url: str):
+    """Repoint every helper at another deployment (e.g. the local stand-in)."""
+    global BASE_URL, API_URL
+    BASE_URL = base_url.rstrip("/")
+    API_URL = api_url.rstrip("/")
+
+
 DEFAULT_DRIVER_PATH = "/Users/noval/Documents/Learn Automation Testing/chromedriver-mac-arm64/chromedriver"
 
 
 # ----------------------
 # Driver utilities
 # ----------------------
-def make_driver():
-    """Create a Chrome driver with a matching binary (auto-download if needed)."""
-    driver_path = os.getenv("CHROME_DRIVER_PATH") or ChromeDriverManager().install()
-    service = Service(executable_path=driver_path)
-    options = webdriver.ChromeOptions()
+@timed
+def make_driver(block=None, profile=None, network_log=False):
+    """
+    Create a Chrome driver with a matching binary (resolved once, see
+    tests/driver_profiles.py). `profile` names a launch profile (default:
+    DRIVER_PROFILE, else "default"); the session starts from a clone of the
+    pre-warmed template (tests/profile_templates.py), removed on quit.
+    `block` lists request categories to block (see tests/network.py); None
+    means the NETWORK_BLOCK default. `network_log=True` turns on Chrome's
+    performance log for request counts; whoever asks for it must drain it
+    (network.drain_log), or it grows for the life of the browser.
+    """
+    name = driver_profiles.profile_name(profile)
+    started = time.perf_counter()
+    service = Service(executable_path=driver_profiles.driver_path())
+    data_dir = profile_templates.session_dir(name, BASE_URL)
+    options = driver_profiles.build_options(name, data_dir)
+    if network_log:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
     driver = webdriver.Chrome(service=service, options=options)
-    driver.maximize_window()
+    if data_dir is not None:
+        driver_profiles.remove_on_quit(driver, data_dir)
+    if driver_profiles.PROFILES[name]["window"] is None:
+        driver.maximize_window()
     driver.implicitly_wait(0)  # rely on explicit waits only
+    network.apply_policy(driver, network.default_categories() if block is None else block)
+    driver_profiles.STARTUP.add(name, time.perf_counter() - started)
     return driver
 
 
 # ----------------------
 # Wait helpers
 # ----------------------
-def wait_click(driver, locator, timeout=10):
+@timed
+def wait_click(driver, locator, timeout=None):
     """Wait until element is clickable, then click."""
-    WebDriverWait(driver, timeout).until(EC.element_to_be_clickable(locator)).click()
+    waits.clickable(driver, locator, timeout).click()
 
 
-def wait_fill(driver, locator, text, timeout=10):
+@timed
+def wait_fill(driver, locator, text, timeout=None):
     """Wait until field visible, clear it, then type text."""
-    field = WebDriverWait(driver, timeout).until(EC.visibility_of_element_located(locator))
+    field = waits.visible(driver, locator, timeout)
     field.clear()
     field.send_keys(text)
 
 
-def wait_alert_text_and_accept(driver, timeout=10):
-    """Wait for alert, grab its text, accept it, return text."""
-    alert = WebDriverWait(driver, timeout).until(EC.alert_is_present())
+@timed
+def fill_form(driver, fields, keystrokes=None, timeout=None):
+    """
+    Fill several fields at once. `fields` maps locator -> value.
+    Default: one in-page script waits until every field is visible, sets the
+    values and fires input/change events. `keystrokes=True` (or
+    FORM_FILL=keystrokes for the whole run) types into each field instead,
+    for tests that need real keyboard events.
+    """
+    if keystrokes is None:
+        keystrokes = os.getenv("FORM_FILL", "script").lower() == "keystrokes"
+    if keystrokes:
+        for locator, value in fields.items():
+            wait_fill(driver, locator, value, timeout)
+        return
+    waits.until_js(
+        driver,
+        scripts.FILL_JS,
+        [[[by, value, str(text)] for (by, value), text in fields.items()]],
+        timeout,
+        "form fields not visible: " + ", ".join(str(locator) for locator in fields),
+    )
+
+
+@timed
+def wait_alert_text_and_accept(driver, timeout=None):
+    """Wait for alert, grab its text, accept it, return text (captured alerts: one call)."""
+    if alerts.is_captured(driver):
+        return alerts.next_message(driver, timeout)
+    alert = waits.alert(driver, timeout)
     text = alert.text
     alert.accept()
     return text
 
 
+# ----------------------
+# Batched DOM reads (one chromedriver round trip each)
+# ----------------------
+def extract(driver, css: str, fields: dict, with_elements: bool = False):
+    """
+    Read many elements in a single script call.
+    `fields` maps output keys to a child CSS selector ("" = the element itself);
+    each match becomes a dict of trimmed visible texts (None if the child is
+    missing). With `with_elements`, each dict also carries the matched
+    WebElement under "element" - a reference only, no extra round trip until
+    you act on it.
+    """
+    return driver.execute_script(scripts.EXTRACT_JS, css, fields, with_elements)
+
+
+def read_text(driver, css: str) -> str:
+    """Visible text of the first match (or '' if none) in one round trip."""
+    return driver.execute_script(
+        "var el = document.querySelector(arguments[0]); return el ? el.innerText.trim() : '';", css
+    )
+
+
+def to_price(text) -> int:
+    """'$360' / '360' -> 360; anything else -> 0."""
+    digits = (text or "").strip().lstrip("$")
+    return int(digits) if digits.isdigit() else 0
+
+
+@timed
+def product_cards(driver, timeout=None, with_elements=False):
+    """Wait for product cards and return [{title, price[, element]}] (one in-page wait, one command)."""
+    fields = {"title": ".card-title", "price": "h5"}
+    cards = waits.until_js(
+        driver,
+        scripts.EXTRACT_WAIT_JS,
+        [L.CARD_CSS, fields, with_elements],
+        timeout,
+        "no product cards",
+        lambda d: extract(d, L.CARD_CSS, fields, with_elements),
+    )
+    for card in cards:
+        card["price"] = to_price(card["price"])
+    return cards
+
+
 # ----------------------
 # Actions
 # ----------------------
+@timed
 def take_screenshot(driver, name: str):
-    """Save screenshot to screenshots/ and attach to Allure."""
-    screenshots_dir = ROOT / "screenshots"
-    screenshots_dir.mkdir(exist_ok=True)
-    path = screenshots_dir / f"{name}.png"
-    driver.get_screenshot_as_file(str(path))
-    allure.attach.file(str(path), name=name, attachment_type=allure.attachment_type.PNG)
+    """Capture a screenshot; saving to screenshots/ and the Allure attach happen in the background."""
+    artifacts.PIPELINE.capture(driver, name)
 
 
+@timed
 def open_home(driver):
-    """Open Demoblaze home and wait for URL to contain 'demoblaze'."""
+    """Open Demoblaze home and wait for URL to contain the site's host."""
     driver.get(BASE_URL)
-    WebDriverWait(driver, 10).until(EC.url_contains("demoblaze"))
+    waits.until(driver, EC.url_contains(urlparse(BASE_URL).netloc), message="home page did not open")
 
 
+@timed
 def login(driver, username: str, password: str):
     """Open login modal and sign in with given credentials."""
-    wait_click(driver, (By.ID, "login2"))
-    wait_fill(driver, (By.ID, "loginusername"), username)
-    wait_fill(driver, (By.ID, "loginpassword"), password)
-    wait_click(driver, (By.XPATH, "//div[@id='logInModal']//button[text()='Log in']"))
-    WebDriverWait(driver, 10).until(
-        EC.text_to_be_present_in_element((By.ID, "nameofuser"), f"Welcome {username}")
-    )
+    wait_click(driver, L.LOGIN_LINK)
+    fill_form(driver, {L.LOGIN_USERNAME: username, L.LOGIN_PASSWORD: password})
+    wait_click(driver, L.LOGIN_SUBMIT)
+    wait_welcome(driver, username)
+
 
+@timed
+def wait_welcome(driver, username: str, timeout=None):
+    """Wait for the 'Welcome <user>' banner that marks a signed-in session."""
+    waits.text_in(driver, L.WELCOME, f"Welcome {username}", timeout)
 
+
+@timed
 def add_first_product_to_cart(driver):
     """Open first product on page and add it to cart."""
     # Open first product card
-    wait_click(driver, (By.CSS_SELECTOR, "#tbodyid .card a[href*='prod.html']"))
-    wait_click(driver, (By.XPATH, "//a[text()='Add to cart']"))
+    wait_click(driver, L.FIRST_CARD_LINK)
+    wait_click(driver, L.ADD_TO_CART)
     alert_text = wait_alert_text_and_accept(driver)
     return alert_text
 
 
+@timed
 def add_product_by_index(driver, index: int = 0):
     """Open product by index on current page and add it to cart."""
-    cards = WebDriverWait(driver, 10).until(
-        EC.presence_of_all_elements_located((By.CSS_SELECTOR, "#tbodyid .card"))
-    )
-    cards[index].find_element(By.CSS_SELECTOR, "a[href*='prod.html']").click()
-    wait_click(driver, (By.XPATH, "//a[text()='Add to cart']"))
+    cards = waits.until(driver, EC.presence_of_all_elements_located(L.CARDS), message="no product cards to open")
+    cards[index].find_element(*L.CARD_LINK).click()
+    wait_click(driver, L.ADD_TO_CART)
+    return wait_alert_text_and_accept(driver)
+
+
+def product_url(product_id) -> str:
+    return f"{BASE_URL}/prod.html?idp_={product_id}"
+
+
+@timed
+def open_product(driver, product_id):
+    """Go straight to a product page (no category click / card lookup)."""
+    driver.get(product_url(product_id))
+    waits.until(driver, lambda d: read_text(d, L.PRODUCT_NAME_CSS), message="product page did not load")
+
+
+@timed
+def add_product_by_id(driver, product_id):
+    """Open a product page by id and add it to cart; returns the alert text."""
+    open_product(driver, product_id)
+    wait_click(driver, L.ADD_TO_CART)
     return wait_alert_text_and_accept(driver)
 
 
+@timed
 def go_to_cart(driver):
     """Navigate to cart page and wait for URL update."""
-    wait_click(driver, (By.ID, "cartur"))
-    WebDriverWait(driver, 10).until(EC.url_contains("cart"))
+    wait_click(driver, L.CART_LINK)
+    waits.until(driver, EC.url_contains("cart"), message="cart page did not open")
 
 
-def cart_rows(driver):
-    """Return list of cart rows with title, price, and row element."""
-    rows = WebDriverWait(driver, 10).until(
-        EC.presence_of_all_elements_located((By.CSS_SELECTOR, "#tbodyid tr"))
-    )
-    data = []
-    for row in rows:
-        cells = row.find_elements(By.TAG_NAME, "td")
-        if len(cells) >= 3:
-            title = cells[1].text.strip()
-            price_txt = cells[2].text.strip()
-            price = int(price_txt) if price_txt.isdigit() else 0
-            data.append({"title": title, "price": price, "row": row})
-    return data
+@timed
+def cart_rows(driver, timeout=None, count=1):
+    """Return list of cart rows with title, price, and row element, once at least `count` have rendered."""
 
+    def rendered(d):
+        rows = extract(d, L.CART_ROW_CSS, {"title": "td:nth-child(2)", "price": "td:nth-child(3)"}, with_elements=True)
+        rows = [r for r in rows if r["price"] is not None]
+        return rows if len(rows) >= count else None
 
+    rows = waits.until(driver, rendered, timeout, f"cart has fewer than {count} rows")
+    return [{"title": r["title"], "price": to_price(r["price"]), "row": r["element"]} for r in rows]
+
+
+@timed
 def delete_first_cart_row(driver):
     """Delete the first cart row."""
-    rows = WebDriverWait(driver, 10).until(
-        EC.presence_of_all_elements_located((By.CSS_SELECTOR, "#tbodyid tr"))
-    )
-    rows[0].find_element(By.LINK_TEXT, "Delete").click()
-    WebDriverWait(driver, 10).until(
-        EC.invisibility_of_element(rows[0])
-    )
+    rows = waits.until(driver, EC.presence_of_all_elements_located(L.CART_ROWS), message="no cart rows to delete")
+    rows[0].find_element(*L.DELETE_LINK).click()
+    waits.until(driver, EC.invisibility_of_element(rows[0]), message="deleted row still shown")
 
 
+@timed
 def open_category(driver, name: str):
-    """Click a category link."""
+    """Click a category link and wait until the old card list has been replaced."""
+    waits.until_js(driver, scripts.MARK_CARDS_JS, [L.CARD_CSS], message="no product cards", key="cards listed")
     wait_click(driver, (By.LINK_TEXT, name))
-    WebDriverWait(driver, 10).until(
-        EC.text_to_be_present_in_element((By.CSS_SELECTOR, "#tbodyid"), "")
+    waits.until_js(
+        driver,
+        scripts.FRESH_CARDS_JS,
+        [L.CARD_CSS],
+        message=f"category {name} did not load",
+        key="category cards",
     )
 
 
+@timed
 def open_contact_modal(driver):
     """Open Contact modal."""
-    wait_click(driver, (By.LINK_TEXT, "Contact"))
-    WebDriverWait(driver, 10).until(
-        EC.visibility_of_element_located((By.ID, "exampleModal"))
-    )
+    wait_click(driver, L.CONTACT_LINK)
+    waits.visible(driver, L.CONTACT_MODAL)
 
 
+@timed
 def submit_contact_form(driver, email: str, name: str, message: str):
     """Fill Contact form and return alert text."""
-    wait_fill(driver, (By.ID, "recipient-email"), email)
-    wait_fill(driver, (By.ID, "recipient-name"), name)
-    wait_fill(driver, (By.ID, "message-text"), message)
-    wait_click(driver, (By.XPATH, "//div[@id='exampleModal']//button[text()='Send message']"))
+    fill_form(driver, {L.CONTACT_EMAIL: email, L.CONTACT_NAME: name, L.CONTACT_MESSAGE: message})
+    wait_click(driver, L.CONTACT_SUBMIT)
     return wait_alert_text_and_accept(driver)
 
 
+@timed
 def open_about_modal(driver):
     """Open About modal with video."""
-    wait_click(driver, (By.LINK_TEXT, "About us"))
-    WebDriverWait(driver, 10).until(
-        EC.visibility_of_element_located((By.ID, "videoModal"))
-    )
+    wait_click(driver, L.ABOUT_LINK)
+    waits.visible(driver, L.ABOUT_MODAL)
 
 
+@timed
 def close_visible_modal(driver):
     """Close whichever modal is currently shown."""
-    wait_click(driver, (By.CSS_SELECTOR, ".modal.show button.close"))
-    WebDriverWait(driver, 10).until(
-        EC.invisibility_of_element_located((By.CSS_SELECTOR, ".modal.show"))
-    )
+    wait_click(driver, L.OPEN_MODAL_CLOSE)
+    waits.invisible(driver, L.OPEN_MODAL)
 
 
+@timed
 def place_order(driver, name, country, city, card, month, year):
     """Open Place Order dialog, fill fields, click Purchase."""
-    wait_click(driver, (By.XPATH, "//button[text()='Place Order']"))
-    wait_fill(driver, (By.ID, "name"), name)
-    wait_fill(driver, (By.ID, "country"), country)
-    wait_fill(driver, (By.ID, "city"), city)
-    wait_fill(driver, (By.ID, "card"), card)
-    wait_fill(driver, (By.ID, "month"), month)
-    wait_fill(driver, (By.ID, "year"), year)
-    wait_click(driver, (By.XPATH, "//button[text()='Purchase']"))
+    wait_click(driver, L.PLACE_ORDER)
+    fill_form(
+        driver,
+        {
+            L.ORDER_NAME: name,
+            L.ORDER_COUNTRY: country,
+            L.ORDER_CITY: city,
+            L.ORDER_CARD: card,
+            L.ORDER_MONTH: month,
+            L.ORDER_YEAR: year,
+        },
+    )
+    wait_click(driver, L.PURCHASE)
 
 
+@timed
 def wait_for_success_modal(driver):
     """Wait for SweetAlert success modal and return it."""
-    return WebDriverWait(driver, 10).until(
-        EC.visibility_of_element_located((By.CSS_SELECTOR, "div.sweet-alert.showSweetAlert.visible"))
-    )
+    return waits.visible(driver, L.SUCCESS_MODAL)
 
 
+@timed
 def register_user_via_ui(username: str, password: str):
     """Register a user in a short-lived browser session and return alert text."""
     driver = make_driver()
     try:
         open_home(driver)
-        wait_click(driver, (By.ID, "signin2"))
-        wait_fill(driver, (By.ID, "sign-username"), username)
-        wait_fill(driver, (By.ID, "sign-password"), password)
-        wait_click(driver, (By.XPATH, "//div[@id='signInModal']//button[text()='Sign up']"))
+        wait_click(driver, L.SIGNUP_LINK)
+        fill_form(driver, {L.SIGNUP_USERNAME: username, L.SIGNUP_PASSWORD: password})
+        wait_click(driver, L.SIGNUP_SUBMIT)
         alert_text = wait_alert_text_and_accept(driver)
         take_screenshot(driver, f"registration_{username}")
         return alert_text
@@ -215,14 +345,15 @@ def register_user_via_ui(username: str, password: str):
 
 
 def generate_username():
-    return f"autouser_{uuid.uuid4().hex[:8]}"
+    worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+    return f"autouser_{worker}_{uuid.uuid4().hex[:8]}"
 
 
+@timed
 def register_user_inline(driver, username: str, password: str):
     """Register using the current driver session (no new browser)."""
     open_home(driver)
-    wait_click(driver, (By.ID, "signin2"))
-    wait_fill(driver, (By.ID, "sign-username"), username)
-    wait_fill(driver, (By.ID, "sign-password"), password)
-    wait_click(driver, (By.XPATH, "//div[@id='signInModal']//button[text()='Sign up']"))
+    wait_click(driver, L.SIGNUP_LINK)
+    fill_form(driver, {L.SIGNUP_USERNAME: username, L.SIGNUP_PASSWORD: password})
+    wait_click(driver, L.SIGNUP_SUBMIT)
     return wait_alert_text_and_accept(driver)
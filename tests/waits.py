@@ -0,0 +1,222 @@
+"""
+Wait engine used by the helpers in utils.py and by BasePage.
+
+Two strategies:
+- in-page waits: one async script that checks the condition on every DOM
+  mutation (plus a cheap in-page 50ms tick for CSS-only changes) and returns
+  the moment it holds - no 0.5s poll gap, one chromedriver call per wait.
+- adaptive polling for things the page cannot observe (native alerts, URL
+  after navigation, arbitrary Python conditions): 50ms first, backing off to
+  500ms.
+
+Every wait is timed; `STATS` feeds the per-run summary printed by conftest.
+Budgets come from the adaptive timeout service (tests/timeouts.py): a
+`timeout` passed here is only the fallback until the action has history.
+"""
+
+import time
+
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoAlertPresentException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    UnexpectedAlertPresentException,
+)
+from selenium.webdriver.support import expected_conditions as EC
+
+from . import scripts
+from .instrumentation import timed
+from .timeouts import SERVICE
+
+
+POLL_INTERVALS = (0.05, 0.05, 0.1, 0.1, 0.2, 0.3, 0.5)
+IGNORED = (NoSuchElementException, StaleElementReferenceException, NoAlertPresentException)
+
+
+class WaitStats:
+    """Accumulates how long the run spent waiting, split by strategy."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.by_kind = {}
+
+    def record(self, kind: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        entry = self.by_kind.setdefault(kind, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    def summary(self) -> str:
+        parts = ", ".join(f"{kind} {n} / {secs:.1f}s" for kind, (n, secs) in sorted(self.by_kind.items()))
+        return f"waits: {self.count} waits, {self.seconds:.1f}s total ({parts})"
+
+
+STATS = WaitStats()
+
+
+# ----------------------
+# Adaptive polling
+# ----------------------
+def _poll(driver, condition, timeout, message):
+    started = time.monotonic()
+    deadline = started + timeout
+    attempt = 0
+    try:
+        while True:
+            try:
+                value = condition(driver)
+                if value:
+                    return value
+            except IGNORED:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(message)
+            time.sleep(min(POLL_INTERVALS[min(attempt, len(POLL_INTERVALS) - 1)], remaining))
+            attempt += 1
+    finally:
+        STATS.record("polled", time.monotonic() - started)
+
+
+@timed
+def until(driver, condition, timeout=None, message="", key=None):
+    """
+    Poll `condition(driver)` until truthy, starting fast and backing off.
+    The budget comes from the timeout service for `key` (default: `message`);
+    `timeout` is only the fallback for uncalibrated keys.
+    """
+    key = key or message
+    budget = SERVICE.timeout_for(key, timeout)
+    started = time.monotonic()
+    try:
+        value = _poll(driver, condition, budget, message)
+    except TimeoutException:
+        SERVICE.record(key, time.monotonic() - started, ok=False)
+        raise
+    SERVICE.record(key, time.monotonic() - started)
+    return value
+
+
+# ----------------------
+# In-page (event-driven) waits
+# ----------------------
+def _ensure_script_timeout(driver, timeout):
+    # set_script_timeout is a round trip itself, so only raise it when needed
+    needed = timeout + 5
+    if getattr(driver, "_wait_script_timeout", 0) < needed:
+        driver.set_script_timeout(needed)
+        driver._wait_script_timeout = needed
+
+
+# chromedriver's messages when a navigation cuts an async script short
+_NAVIGATION_ERRORS = ("document unloaded", "navigated or closed", "execution context was destroyed")
+
+
+def _interrupted(exc) -> bool:
+    """True if the in-page wait was cut short (navigation, script timeout) rather than broken."""
+    if isinstance(exc, TimeoutException):
+        return True
+    message = (exc.msg or "").lower()
+    return any(text in message for text in _NAVIGATION_ERRORS)
+
+
+@timed
+def until_js(driver, body: str, args=None, timeout=None, message="", fallback=None, key=None):
+    """
+    Resolve `body` (JS returning a truthy value when done) inside the page.
+    `body` sees `args`, `__find(by, value)` and `__visible(el)`. If the page
+    navigates away mid-wait (or the script times out with it), finish with
+    `fallback` (a Python condition) using adaptive polling; any other
+    WebDriver error - a dead session, a broken script - is raised as is.
+    Timeout handling is the same as `until`.
+    """
+    key = key or message
+    budget = SERVICE.timeout_for(key, timeout)
+    started = time.monotonic()
+    _ensure_script_timeout(driver, budget)
+    try:
+        result = driver.execute_async_script(
+            scripts.ASYNC_WAIT_JS.replace("/*CHECK*/", body), args or [], int(budget * 1000)
+        )
+    except UnexpectedAlertPresentException:
+        STATS.record("in-page", time.monotonic() - started)
+        raise
+    except (JavascriptException, TimeoutException) as exc:
+        if fallback is None or not _interrupted(exc):
+            raise
+        elapsed = time.monotonic() - started
+        STATS.record("in-page", elapsed)
+        try:
+            result = _poll(driver, fallback, max(budget - elapsed, 0.1), message)
+        except TimeoutException:
+            SERVICE.record(key, time.monotonic() - started, ok=False)
+            raise
+        SERVICE.record(key, time.monotonic() - started)
+        return result
+    STATS.record("in-page", time.monotonic() - started)
+    if not result:
+        SERVICE.record(key, time.monotonic() - started, ok=False)
+        raise TimeoutException(message)
+    SERVICE.record(key, time.monotonic() - started)
+    return result
+
+
+# ----------------------
+# Common conditions
+# ----------------------
+def visible(driver, locator, timeout=None):
+    """Element located by `locator` once it is displayed."""
+    return until_js(
+        driver,
+        "var el = __find(args[0], args[1]); return __visible(el) ? el : null;",
+        list(locator),
+        timeout,
+        f"{locator} not visible",
+        EC.visibility_of_element_located(locator),
+    )
+
+
+def clickable(driver, locator, timeout=None):
+    """Element located by `locator` once it is displayed and enabled."""
+    return until_js(
+        driver,
+        "var el = __find(args[0], args[1]); return (__visible(el) && !el.disabled) ? el : null;",
+        list(locator),
+        timeout,
+        f"{locator} not clickable",
+        EC.element_to_be_clickable(locator),
+    )
+
+
+def invisible(driver, locator, timeout=None):
+    """True once nothing matching `locator` is displayed."""
+    return until_js(
+        driver,
+        "return !__visible(__find(args[0], args[1]));",
+        list(locator),
+        timeout,
+        f"{locator} still visible",
+        EC.invisibility_of_element_located(locator),
+    )
+
+
+def text_in(driver, locator, text, timeout=None):
+    """True once the element's visible text contains `text`."""
+    return until_js(
+        driver,
+        "var el = __find(args[0], args[1]); return !!el && el.innerText.indexOf(args[2]) !== -1;",
+        [locator[0], locator[1], text],
+        timeout,
+        f"{text!r} not in {locator}",
+        EC.text_to_be_present_in_element(locator, text),
+        key=f"text in {locator}",
+    )
+
+
+def alert(driver, timeout=None):
+    """Native alerts block page scripts, so these are polled (adaptively)."""
+    return until(driver, EC.alert_is_present(), timeout, "no alert")